@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+
+# Startup time of main.py: `--help`, building a single suite and (for comparison) building every suite.
+# Each scenario is run in a fresh interpreter inside a temporary directory, so generated `testdata` does not pollute the repository.
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from typing import Dict, List
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+HEAVY_MODULES = ['numpy', 'PIL']
+
+def __scenarios(suite: str) -> Dict[str, List[str]]:
+	return {
+		'main.py --help': [os.path.join(ROOT, 'main.py'), '--help'],
+		"suite '%s' only" % (suite): ['-c', "import testsuites; testsuites.get_instance('%s')" % (suite)],
+		'all suites (eager)': ['-c', 'import testsuites; [testsuites.get_instance(s) for s in testsuites.SUITES]']
+	}
+
+def __measure(args: List[str], cwd: str, repeat: int) -> List[float]:
+	env = dict(os.environ, PYTHONPATH = ROOT)
+	timings: List[float] = []
+	for _ in range(repeat):
+		start = time.perf_counter()
+		subprocess.run([sys.executable] + args, cwd = cwd, env = env, stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL, check = True)
+		timings.append((time.perf_counter() - start) * 1000)
+	return timings
+
+def __imported_heavy_modules(args: List[str], cwd: str) -> List[str]:
+	env = dict(os.environ, PYTHONPATH = ROOT)
+	proc = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd = cwd, env = env, stdout = subprocess.DEVNULL, stderr = subprocess.PIPE, universal_newlines = True, check = True)
+	imported = set(line.rsplit('|', 1)[-1].strip() for line in proc.stderr.splitlines())
+	return [m for m in HEAVY_MODULES if m in imported]
+
+if __name__ == '__main__':
+	parser = argparse.ArgumentParser()
+	parser.add_argument('--suite', help = 'suite to build in the single suite scenario', type = str, default = 'sum')
+	parser.add_argument('--repeat', help = 'number of runs per scenario', type = int, default = 5)
+	args = parser.parse_args()
+
+	with tempfile.TemporaryDirectory() as cwd:
+		for name, scenario in __scenarios(args.suite).items():
+			timings = __measure(scenario, cwd, args.repeat)
+			heavy = __imported_heavy_modules(scenario, cwd)
+			print("%-24s min %8.1f ms, median %8.1f ms, imports: %s" % (name, min(timings), statistics.median(timings), ', '.join(heavy) if heavy else '-'))
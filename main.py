@@ -6,22 +6,13 @@ import json
 import random
 import string
 
-from typing import Dict, Tuple, Optional
+from typing import Dict, List, Optional, Tuple
 
+import testsuites
 import testsuites.base as base
-import testsuites.sum as suite_sum
-import testsuites.invertible_matrix as suite_invertible_matrix
-import testsuites.sprintf as suite_sprintf
-import testsuites.expression as suite_expression
-import testsuites.png as suite_png
-
-SELECTOR: Dict[str, Tuple[base.BaseTester, Optional[Dict[str, float]]]] = {
-	suite_sum.SUITE_NAME: suite_sum.get_instance(),
-	suite_invertible_matrix.SUITE_NAME: suite_invertible_matrix.get_instance(),
-	suite_sprintf.SUITE_NAME: suite_sprintf.get_instance(),
-	suite_expression.SUITE_NAME: suite_expression.get_instance(),
-	suite_png.SUITE_NAME: suite_png.get_instance()
-}
+
+# Only the selected suite is built (see `testsuites.get_instance`).
+SELECTOR: Dict[str, str] = testsuites.SUITES
 
 def __t_or_f(arg: str, flag_name: str) -> bool:
 	ua = str(arg).upper()
@@ -46,6 +37,35 @@ def __calculate_final_sum(results: base.BaseSuite, coefficients: Dict[str, float
 		f_sum += coefficient * raw
 	return f_sum / n_categories
 
+# Executables named directly or found in named directories.
+def __collect_programs(paths: List[str]) -> List[str]:
+	programs: List[str] = []
+	for path in paths:
+		if not os.path.isdir(path):
+			programs.append(os.path.abspath(path))
+			continue
+		for name in sorted(os.listdir(path)):
+			candidate = os.path.join(path, name)
+			executable = name.lower().endswith('.exe') if base.is_windows() else os.access(candidate, os.X_OK)
+			if os.path.isfile(candidate) and executable:
+				programs.append(os.path.abspath(candidate))
+	return programs
+
+# Programs ordered by number of passed tests, then by total time of their runs.
+def __make_leaderboard(programs: List[str], results: List[base.BaseSuite], final_sums: List[Optional[float]]) -> List[dict]:
+	leaderboard = []
+	for program, suite, final_sum in zip(programs, results, final_sums):
+		suite_results = [result for _, result in suite.get_results()]
+		leaderboard.append({
+			'program': program,
+			'passed': sum(1 for result in suite_results if result.ok()),
+			'total': len(suite_results),
+			'final_sum': final_sum,
+			'time_ms': sum(result.wall_time_ns or 0 for result in suite_results) / 1000000
+		})
+	leaderboard.sort(key = lambda entry: (-entry['passed'], entry['time_ms']))
+	return leaderboard
+
 def __generate_unique_filename() -> str:
 	while True:
 		random_part = ''.join(random.choices(string.ascii_letters + string.digits, k = 10))
@@ -57,26 +77,67 @@ def __generate_unique_filename() -> str:
 
 if __name__ == '__main__':
 	parser = argparse.ArgumentParser()
-	parser.add_argument('--program', help = 'path to the program under test', type = str, required = True)
+	parser.add_argument('--program', help = 'paths to the programs under test or directories with them (several programs are compared)', type = str, nargs = '+', required = True)
 	parser.add_argument('--suite', help = 'select testing task', type = str, choices = SELECTOR, required = True)
 	parser.add_argument('--check-output', help = 'is it necessary to check the program\'s output', type = str, default = 'TRUE')
 	parser.add_argument('--timeout-factor', help = 'maximum execution time multiplier', type = float, default = 1.0)
+	parser.add_argument('--stress', help = 'add stress tests (large inputs), where suite supports them', type = str, default = 'FALSE')
+	parser.add_argument('--fuzz', help = 'add this number of randomly generated tests, where suite supports them', type = int, default = 0)
+	parser.add_argument('--fuzz-depth', help = 'maximum depth of randomly generated tests', type = int, default = 4)
+	parser.add_argument('--seed', help = 'seed of random generation of tests', type = int, default = 0)
+	parser.add_argument('--jobs', help = 'number of tests running at the same time', type = int, default = 1)
+	parser.add_argument('--backend', help = 'how tests are run at the same time: by a pool of threads or by one event loop (cheaper for large --jobs)', type = str, choices = base.BaseRunOptions.BACKENDS, default = 'threads')
+	parser.add_argument('--fail-fast', help = 'skip all remaining tests after the first failed one', type = str, default = 'FALSE')
+	parser.add_argument('--abort-after', help = 'skip remaining tests of a category after this number of consecutive timeouts in it (0 - never)', type = int, default = 0)
+	parser.add_argument('--smoke-first', help = 'run the cheapest test of each category before all others', type = str, default = 'FALSE')
+	parser.add_argument('--sandbox', help = 'run each test in its own temporary working directory', type = str, default = 'FALSE')
+	parser.add_argument('--memory-limit', help = 'address space limit of the program in MiB (0 - no limit, POSIX only)', type = int, default = 0)
+	parser.add_argument('--cpu-limit', help = 'CPU time limit of the program in seconds (0 - no limit, POSIX only)', type = int, default = 0)
+	parser.add_argument('--file-size-limit', help = 'limit of size of files written by the program in MiB (0 - no limit, POSIX only)', type = int, default = 0)
+	parser.add_argument('--output-limit', help = 'limit of stdout and stderr of the program together in MiB, the program is killed after it (0 - no limit)', type = int, default = 0)
+	parser.add_argument('--capture-limit', help = 'size of each output stream of the program kept in memory in MiB, the rest is written to disk', type = int, default = base.BaseCapture.MEMORY_LIMIT // (1024 * 1024))
+	parser.add_argument('--batch', help = 'pass tests to one long-lived process per job through its stdin (program should support batch protocol), where suite supports it', type = str, default = 'FALSE')
+	parser.add_argument('--rerun-failed', help = 'JSON report of a previous run: run only tests, which failed or changed since then, and merge results', type = str, default = None)
+	parser.add_argument('--minimize', help = 'after run, reduce each failed test to the smallest input failing with the same verdict, where suite supports it', type = str, default = 'FALSE')
+	parser.add_argument('--bench', help = 'benchmark mode: number of measured runs of each test (0 - disabled)', type = int, default = 0)
+	parser.add_argument('--bench-warmup', help = 'benchmark mode: number of unmeasured warmup runs of each test', type = int, default = 1)
 	parser.add_argument('--json-quick', help = 'JSON results: quick generating output filename, run target system, used compile for building program, build type compiled and run program for quick testing', type = str, default = 'FALSE')
 	parser.add_argument('--json-output-name', help = 'JSON results: output filename', type = str, default = None)
 	parser.add_argument('--json-target-system', help = 'JSON results: run target system', type = str, default = None)
 	parser.add_argument('--json-use-compiler', help = 'JSON results: used compiler for building program', type = str, default = None)
 	parser.add_argument('--json-build-type', help = 'JSON results: build type compiled and run program', type = str, default = None)
+	parser.add_argument('--json-field-limit', help = 'JSON results: maximum length of test\'s input, output, reference and stderr in report, longer ones are truncated and fully written into side files (0 - no limit)', type = int, default = 0)
 	parser.add_argument('--json-final-results', help = '(DEPRECATED) JSON results: calculation of coefficients for tests and output to JSON file (if activated) final test results, if necessary environment variables exist', type = str, default = 'FALSE')
 
 	args = parser.parse_args()
 
 	# Base arguments.
-	base_program: str = os.path.abspath(args.program)
+	base_programs: List[str] = __collect_programs(args.program)
 	base_suite: str = args.suite
 
 	# Test setup.
 	setup_check_output: bool = __t_or_f(args.check_output, "check-output")
 	setup_timeout_factor: float = args.timeout_factor
+	setup_stress: bool = __t_or_f(args.stress, "stress")
+	setup_fuzz: int = args.fuzz
+	setup_fuzz_depth: int = args.fuzz_depth
+	setup_seed: int = args.seed
+	setup_jobs: int = args.jobs
+	setup_backend: str = args.backend
+	setup_fail_fast: bool = __t_or_f(args.fail_fast, "fail-fast")
+	setup_abort_after: int = args.abort_after
+	setup_smoke_first: bool = __t_or_f(args.smoke_first, "smoke-first")
+	setup_sandbox: bool = __t_or_f(args.sandbox, "sandbox")
+	setup_memory_limit: int = args.memory_limit
+	setup_cpu_limit: int = args.cpu_limit
+	setup_file_size_limit: int = args.file_size_limit
+	setup_output_limit: int = args.output_limit
+	setup_capture_limit: int = args.capture_limit
+	setup_batch: bool = __t_or_f(args.batch, "batch")
+	setup_rerun_failed: Optional[str] = args.rerun_failed
+	setup_minimize: bool = __t_or_f(args.minimize, "minimize")
+	setup_bench: int = args.bench
+	setup_bench_warmup: int = args.bench_warmup
 
 	# JSON results.
 	json_quick: bool = __t_or_f(args.json_quick, "json-quick")
@@ -84,6 +145,7 @@ if __name__ == '__main__':
 	json_target_system: str = args.json_target_system
 	json_use_compiler: str = args.json_use_compiler
 	json_build_type: str = args.json_build_type
+	json_field_limit: int = args.json_field_limit
 	json_final_results: bool = __t_or_f(args.json_final_results, "json-final-results")
 
 	if not json_quick:
@@ -91,30 +153,124 @@ if __name__ == '__main__':
 			print('usage: --json-output-name requires --json-target-system, --json-use-compiler and --json-build-type.')
 			exit(1)
 
-	task_select, coefficients = SELECTOR[base_suite]
-	results = task_select.run(base_program, setup_check_output, setup_timeout_factor)
-	exitcode = 0 if results.ok() else 1
+	if len(base_programs) == 0:
+		print('usage: --program should name at least one executable.')
+		exit(1)
 
-	json_final_sum = __calculate_final_sum(results, coefficients)
+	if len(base_programs) > 1 and setup_rerun_failed is not None:
+		print('usage: --rerun-failed requires a single program.')
+		exit(1)
 
-	if not json_output_name is None or json_quick:
-		json_full_dict: Dict[str, dict] = {}
+	if setup_fuzz < 0 or setup_fuzz_depth < 0:
+		print('usage: --fuzz and --fuzz-depth should not be negative.')
+		exit(1)
+
+	if setup_bench < 0 or setup_bench_warmup < 0:
+		print('usage: --bench and --bench-warmup should not be negative.')
+		exit(1)
+
+	if setup_memory_limit < 0 or setup_cpu_limit < 0 or setup_file_size_limit < 0 or setup_output_limit < 0 or setup_capture_limit < 0:
+		print('usage: --memory-limit, --cpu-limit, --file-size-limit, --output-limit and --capture-limit should not be negative.')
+		exit(1)
+
+	# Arguments are checked before the suite is built: fixtures may take long to generate.
+	task_select, coefficients = testsuites.get_instance(base_suite, base.BaseSuiteOptions(stress = setup_stress, fuzz = setup_fuzz, fuzz_depth = setup_fuzz_depth, seed = setup_seed))
 
-		json_full_dict['target_system'] = json_target_system if not json_quick else 'Any target system'
-		json_full_dict['use_compiler'] = json_use_compiler if not json_quick else 'Any use compiler'
-		json_full_dict['build_type'] = json_build_type if not json_quick else 'Any build type'
-		json_full_dict['passed'] = results.ok()
-		json_full_dict['final_sum'] = json_final_sum
-		json_full_dict['raw_results'] = results.get_raw_results()
-		json_full_dict.update(results.json())
+	sandbox = base.BaseSandbox(
+		memory_limit = setup_memory_limit * 1024 * 1024,
+		cpu_limit = setup_cpu_limit,
+		file_size_limit = setup_file_size_limit * 1024 * 1024,
+		output_limit = setup_output_limit * 1024 * 1024,
+		capture_limit = setup_capture_limit * 1024 * 1024,
+		isolate = setup_sandbox
+	)
 
-		json_object = json.dumps(json_full_dict, indent = 4)
+	reused_results: Dict[int, base.BaseResult] = {}
+	if setup_rerun_failed is not None:
+		reused_results = task_select.get_reusable_results(base.BaseReportWriter.load(setup_rerun_failed))
+		print("-- Rerunning %d of %d tests, other results are taken from %s" % (len(task_select.get_tests()) - len(reused_results), len(task_select.get_tests()), setup_rerun_failed))
 
+	# Header of JSON report is written before the run, results of a single program - as soon as they are known, summary - at the end.
+	json_writer: Optional[base.BaseReportWriter] = None
+	if not json_output_name is None or json_quick:
 		if json_output_name is None:
 			json_output_name = __generate_unique_filename()
+		json_writer = base.BaseReportWriter(json_output_name, json_field_limit)
+		json_writer.write('target_system', json_target_system if not json_quick else 'Any target system')
+		json_writer.write('use_compiler', json_use_compiler if not json_quick else 'Any use compiler')
+		json_writer.write('build_type', json_build_type if not json_quick else 'Any build type')
+
+	multiple = len(base_programs) > 1
+	run_options = base.BaseRunOptions(
+		jobs = setup_jobs,
+		repeat = setup_bench,
+		warmup = setup_bench_warmup,
+		bench = setup_bench > 0,
+		fail_fast = setup_fail_fast,
+		abort_after = setup_abort_after,
+		smoke_first = setup_smoke_first,
+		batch = setup_batch,
+		sandbox = sandbox,
+		backend = setup_backend,
+		reuse = reused_results,
+		on_result = json_writer.write_result if json_writer is not None and not multiple else None,
+		# Report of several programs is written after all of them are run, so their outputs are kept till then.
+		release = json_writer is None or not multiple
+	)
+	all_results = task_select.run_many(base_programs, setup_check_output, setup_timeout_factor, run_options)
+	exitcode = 0 if all(results.ok() for results in all_results) else 1
+
+	json_programs: Dict[str, dict] = {}
+	json_final_sums: List[Optional[float]] = []
+	for p, (base_program, results) in enumerate(zip(base_programs, all_results)):
+		prefix = "%s: " % (base_program) if multiple else ""
+
+		bench_results = results.get_bench_results() if run_options.bench else None
+		if bench_results is not None:
+			for category, stats in sorted(bench_results['categories'].items()):
+				print("-- Bench %s%s: %d runs, min %.3f ms, median %.3f ms, p95 %.3f ms, stddev %.3f ms" % (prefix, category, stats['runs'], stats['min'], stats['median'], stats['p95'], stats['stddev']))
+
+		minimized: Dict[int, Tuple[base.BaseTest, base.BaseResult]] = {}
+		if setup_minimize and not results.ok():
+			minimized = task_select.minimize(base_program, setup_check_output, setup_timeout_factor, results, run_options)
+			for i, minimized_results in sorted(minimized.items()):
+				test, result = minimized_results
+				print("-- Minimized %s%s to %s (verdict: %s)" % (prefix, task_select.get_tests()[i].name, test.get_input(), result.get_verdict()))
+
+		json_final_sum = __calculate_final_sum(results, coefficients)
+		json_final_sums.append(json_final_sum)
+
+		if json_writer is None:
+			continue
+		json_program: Dict[str, object] = {}
+		if multiple:
+			json_program['tests'] = { "test_%d" % (i): json_writer.json_result("program_%d.test_%d" % (p, i), test, result) for i, (test, result) in enumerate(results.get_results()) }
+		json_program['passed'] = results.ok()
+		json_program['final_sum'] = json_final_sum
+		json_program['raw_results'] = results.get_raw_results()
+		json_program['grouped_results'] = results.get_grouped_results()
+		if bench_results is not None:
+			json_program['bench'] = bench_results
+		if len(minimized) != 0:
+			json_program['minimized'] = { "test_%d" % (i): base.BaseSuite.json_result(test, result) for i, (test, result) in sorted(minimized.items()) }
+		json_programs[base_program] = json_program
+
+	leaderboard: List[dict] = []
+	if multiple:
+		leaderboard = __make_leaderboard(base_programs, all_results, json_final_sums)
+		print("-- Leaderboard:")
+		for place, entry in enumerate(leaderboard, 1):
+			print("   %d. %s: %d/%d passed, final sum %s, total time %.3f ms" % (place, entry['program'], entry['passed'], entry['total'], entry['final_sum'], entry['time_ms']))
 
-		with open(json_output_name, 'w') as file:
-			file.write(json_object)
+	if json_writer is not None:
+		if multiple:
+			json_writer.write('passed', exitcode == 0)
+			json_writer.write('programs', json_programs)
+			json_writer.write('leaderboard', leaderboard)
+		else:
+			for key, value in json_programs[base_programs[0]].items():
+				json_writer.write(key, value)
+		json_writer.close()
 
 		print(f"-- JSON reported in {json_output_name}")
 
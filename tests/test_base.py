@@ -0,0 +1,228 @@
+import json
+import os
+import stat
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+import testsuites.base as base
+
+# Shell script with the given body, ready to be run as a tested program.
+def make_program(tmp_path, body: str) -> str:
+	path = os.path.join(str(tmp_path), 'program.sh')
+	with open(path, 'w') as file:
+		file.write('#!/bin/sh\n' + body)
+	os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+	return path
+
+@pytest.mark.skipif(os.name != 'posix', reason = 'shell scripts are used as programs')
+def test_timeout_keeps_partial_output(tmp_path):
+	tester = base.BaseTester(is_stdin_input = False)
+	tester.add_success('partial', [], 'partial', timeout = 0.5)
+	program = make_program(tmp_path, 'echo partial\necho oops >&2\nsleep 5\n')
+
+	result = tester.get_tests()[0].run(program, True, 1.0)
+
+	assert result.get_errno() == base.Errno.ERROR_TIMEOUT
+	assert result.output == 'partial\n'
+	assert result.stderr == 'oops\n'
+
+@pytest.mark.skipif(os.name != 'posix', reason = 'shell scripts are used as programs')
+def test_large_output_is_compared_from_file(tmp_path, monkeypatch):
+	monkeypatch.setattr(base.BaseArtifacts, 'TEXT_LIMIT', 4)
+	reference = os.path.join(str(tmp_path), 'reference.txt')
+	with open(reference, 'w') as file:
+		file.write('first\nsecond\n')
+	output = os.path.join(str(tmp_path), 'output.txt')
+	tester = base.BaseTester(is_stdin_input = False, is_raw_output = False)
+	tester.add_success('large', [output], reference, output_stream = output)
+	program = make_program(tmp_path, 'printf "first\\nsecond\\n" > "$1"\n')
+
+	result = tester.get_tests()[0].run(program, True, 1.0)
+
+	assert result.ok()
+	assert result.output.startswith('firs\n<truncated')
+	assert base.BaseSuite.json_result(tester.get_tests()[0], result)['reference'].startswith('firs\n<truncated')
+
+@pytest.mark.skipif(os.name != 'posix', reason = 'limits are applied on POSIX only')
+def test_expected_failure_within_memory_limit(tmp_path):
+	sandbox = base.BaseSandbox(memory_limit = 256 << 20)
+	tester = base.BaseTester(is_stdin_input = False)
+	tester.add_failed('negative', [], 3)
+	program = make_program(tmp_path, 'echo "bad input" >&2\nexit 3\n')
+
+	assert tester.get_tests()[0].run(program, True, 1.0, sandbox = sandbox).ok()
+
+	# Program using memory near the limit, but exiting by itself, is judged by its exit code.
+	execution = base.BaseExecution()
+	execution.returncode = 3
+	execution.peak_rss = 200 << 20
+	assert sandbox.check_limits(execution) is None
+
+@pytest.mark.skipif(os.name != 'posix', reason = 'shell scripts are used as programs')
+def test_timeout_keeps_only_beginning_of_long_output(tmp_path):
+	sandbox = base.BaseSandbox(capture_limit = 1024)
+	tester = base.BaseTester(is_stdin_input = False)
+	tester.add_success('endless', [], 'y', timeout = 0.5)
+	program = make_program(tmp_path, 'while :; do echo y; done\n')
+
+	result = tester.get_tests()[0].run(program, True, 1.0, sandbox = sandbox)
+
+	assert result.get_errno() == base.Errno.ERROR_TIMEOUT
+	text, note = result.output.split('\n<truncated: ')
+	assert text == 'y\n' * 512
+	assert note == 'stdout is longer than 1024 bytes>'
+
+@pytest.mark.skipif(os.name != 'posix', reason = 'shell scripts are used as programs')
+def test_long_output_is_compared_from_capture(tmp_path):
+	sandbox = base.BaseSandbox(capture_limit = 64)
+	tester = base.BaseTester(is_stdin_input = False)
+	expected = [str(i) for i in range(1000)]
+	tester.add_success('long', [], expected)
+	tester.add_success('long mismatch', [], expected[:-1] + ['998'])
+	program = make_program(tmp_path, 'i=0\nwhile [ $i -lt 1000 ]; do printf "%d\\r\\n" $i; i=$((i + 1)); done\n')
+
+	passed, failed = (test.run(program, True, 1.0, sandbox = sandbox) for test in tester.get_tests())
+
+	assert passed.ok()
+	assert passed.output.endswith('\n<truncated: stdout is longer than 64 bytes>')
+	assert failed.get_errno() == base.Errno.ERROR_ASSERTION
+
+@pytest.mark.skipif(os.name != 'posix', reason = 'limits are applied on POSIX only')
+def test_crash_under_memory_limit_is_only_possible_exceeding(tmp_path):
+	sandbox = base.BaseSandbox(memory_limit = 256 << 20)
+	tester = base.BaseTester(is_stdin_input = False)
+	tester.add_success('crash', [], '')
+	tester.add_success('allocation', [], '')
+	crash, allocation = tester.get_tests()
+
+	# Crash with little memory used, as after `malloc` returned NULL.
+	result = crash.run(make_program(tmp_path, 'kill -SEGV $$\n'), True, 1.0, sandbox = sandbox)
+	assert result.get_errno() == base.Errno.ERROR_CRASH_MEMORY_LIMIT
+
+	result = allocation.run(make_program(tmp_path, 'echo "MemoryError" >&2\nexit 1\n'), True, 1.0, sandbox = sandbox)
+	assert result.get_errno() == base.Errno.ERROR_MEMORY_LIMIT
+
+@pytest.mark.skipif(os.name != 'posix', reason = 'limits are applied on POSIX only')
+@pytest.mark.parametrize('prlimit', [True, False])
+def test_limits_are_applied_without_preexec_fn(tmp_path, monkeypatch, prlimit):
+	if not prlimit:
+		monkeypatch.setattr(base.shutil, 'which', lambda name: None)
+	sandbox = base.BaseSandbox(memory_limit = 256 << 20, cpu_limit = 2, file_size_limit = 1 << 20)
+	tester = base.BaseTester(is_stdin_input = False)
+	tester.add_success('limits', [], ['262144', '3', '2048'])
+	program = make_program(tmp_path, 'ulimit -S -v\nulimit -H -t\nulimit -S -f\n')
+
+	result = tester.get_tests()[0].run(program, True, 1.0, sandbox = sandbox)
+
+	assert result.ok(), result.output
+
+def test_fixture_cache_detects_stale_manifest(tmp_path):
+	fixture = os.path.join(str(tmp_path), 'fixture.txt')
+	with open(fixture, 'w') as file:
+		file.write('1 2\n')
+	cache = base.BaseFixtureCache(str(tmp_path), { 'seed': 1 }, [])
+	cache.store([['1 2', '3']], [fixture])
+	assert cache.load() == [['1 2', '3']]
+
+	# Edited fixture of the same size.
+	with open(fixture, 'w') as file:
+		file.write('3 4\n')
+	assert cache.load() is None
+
+	cache.store([], [fixture])
+	manifest = os.path.join(str(tmp_path), 'fixtures.json')
+	with open(manifest) as file:
+		key = json.load(file)['key']
+	for contents in [[], 'key', { 'key': 1 }, { 'files': {}, 'fixtures': [] }, { 'key': key, 'files': [] }, { 'key': key, 'files': {} }]:
+		with open(manifest, 'w') as file:
+			json.dump(contents, file)
+		assert cache.load() is None
+		assert not os.path.exists(manifest)
+
+def test_report_is_loaded_up_to_last_complete_entry(tmp_path):
+	path = os.path.join(str(tmp_path), 'report.json')
+	tester = base.BaseTester(is_stdin_input = False)
+	tester.add_success('short', ['1', '2'], '3', categories = ['sum'])
+	tester.add_success('long', ['x' * 20], 'y' * 20, categories = ['long'])
+	tester.add_failed('negative', ['-'], 1, categories = ['sum'])
+	results = [base.err_ok(), base.err_timeout(), base.err_should_fail()]
+	results[0].output = '3\n'
+	results[1].output = 'z' * 30
+	results[1].stderr = 'e' * 30
+
+	writer = base.BaseReportWriter(path, field_limit = 8)
+	for i, (test, result) in enumerate(zip(tester.get_tests(), results)):
+		writer.write_result(i, test, result)
+	writer.close()
+
+	report = base.BaseReportWriter.load(path)
+	assert list(report) == ['test_0', 'test_1', 'test_2']
+	# Long fields are spilled into side files and read back in full.
+	long = report['test_1']
+	assert long['input'] == 'x' * 20 and long['reference'] == 'y' * 20 and long['output'] == 'z' * 30 and long['stderr'] == 'e' * 30
+	assert os.path.isfile(os.path.join(str(tmp_path), long['output_file']))
+	with open(path) as file:
+		text = file.read()
+	assert json.loads(text)['test_1']['output'] == 'z' * 8
+	assert report['test_0']['output'] == '3\n' and 'output_file' not in report['test_0']
+
+	# Run interrupted at any moment.
+	truncated = os.path.join(str(tmp_path), 'truncated.json')
+	for end in range(len(text)):
+		with open(truncated, 'w') as file:
+			file.write(text[:end])
+		partial = base.BaseReportWriter.load(truncated)
+		assert list(partial) == list(report)[:len(partial)]
+		for key, value in partial.items():
+			assert value == report[key]
+
+def test_abort_policy_skips_after_failure_and_consecutive_timeouts():
+	tester = base.BaseTester(is_stdin_input = False)
+	for name, categories in [('a', ['slow']), ('b', ['slow', 'other']), ('c', ['other'])]:
+		tester.add_success(name, [], '', categories = categories)
+	a, b, c = tester.get_tests()
+	skipped = base.BaseResult(base.Errno.ERROR_SKIPPED)
+
+	policy = base.BaseAbortPolicy(base.BaseRunOptions(fail_fast = True))
+	policy.update(a, skipped)
+	assert policy.skip_reason(b) is None
+	policy.update(a, base.err_ok())
+	assert policy.skip_reason(b) is None
+	policy.update(a, base.err_timeout())
+	assert policy.skip_reason(c) == 'fail fast: one of previous tests failed'
+
+	policy = base.BaseAbortPolicy(base.BaseRunOptions(abort_after = 2))
+	policy.update(a, base.err_timeout())
+	# Passed test breaks the series of timeouts in its categories.
+	policy.update(b, base.err_ok())
+	policy.update(a, base.err_timeout())
+	assert policy.skip_reason(a) is None
+	# Skipped test does not.
+	policy.update(b, skipped)
+	policy.update(b, base.err_timeout())
+	assert policy.skip_reason(a) == "category 'slow' aborted after 2 consecutive timeouts"
+	assert policy.skip_reason(b) is not None
+	# Failures other than timeouts do not abort anything without fail fast.
+	assert policy.skip_reason(c) is None
+	policy.update(c, base.err_should_fail())
+	assert policy.skip_reason(c) is None
+
+def test_only_unchanged_passed_tests_are_reused():
+	tester = base.BaseTester(is_stdin_input = False)
+	tester.add_success('passed', ['1', '2'], '3')
+	tester.add_success('failed', ['2', '2'], '4')
+	tester.add_success('changed', ['3', '3'], '6')
+	tester.add_success('renamed', ['4', '4'], '8')
+	tests = tester.get_tests()
+	results = [base.err_ok(), base.err_timeout(), base.err_ok(), base.err_ok()]
+	report = { "test_%d" % (i): base.BaseSuite.json_result(test, result) for i, (test, result) in enumerate(zip(tests, results)) }
+	report['test_2']['reference'] = '7'
+	report['test_3']['name'] = 'old name'
+
+	reusable = tester.get_reusable_results(report)
+
+	assert list(reusable) == [0]
+	assert reusable[0].ok()
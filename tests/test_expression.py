@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+import testsuites.base as base
+import testsuites.expression as expression
+
+# Module-level helpers of the suite are private.
+parse = getattr(expression, '__parse')
+evaluate = getattr(expression, '__evaluate')
+MathError = getattr(expression, '__MathError')
+
+GOOD_TESTS = [test for _, _, test in getattr(expression, '__generate_good_tests')()]
+BAD_TESTS = [test for _, _, _, test in getattr(expression, '__generate_bad_tests')()]
+
+# Oracle of fuzz tests agrees with the hand-written tables.
+@pytest.mark.parametrize('test', GOOD_TESTS, ids = [test.get_input() for test in GOOD_TESTS])
+def test_oracle_evaluates_good_tests(test):
+	node = parse(test.get_input())
+	assert node is not None
+	assert str(evaluate(node)) == test.get_expected()
+
+@pytest.mark.parametrize('test', BAD_TESTS, ids = [test.get_input() for test in BAD_TESTS])
+def test_oracle_rejects_bad_tests(test):
+	node = parse(test.get_input())
+	if test.get_returncode() != expression.E_MATH:
+		assert node is None
+		return
+	assert node is not None
+	with pytest.raises(MathError):
+		evaluate(node)
+
+def test_shrinker_keeps_oracle_answers():
+	tester = base.BaseTester(is_stdin_input = False)
+	tester.add_success('complex', '( 6 / ( 3 - 1 ) ) * -4', '-12', categories = ['complex'])
+	test = tester.get_tests()[0]
+
+	candidates = getattr(expression, '__shrink_test')(test, base.BaseComparator())
+
+	inputs = [candidate.get_raw_input() for candidate in candidates]
+	assert len(inputs) == len(set(inputs)) and test.get_raw_input() not in inputs
+	# Outermost reductions come first.
+	assert parse(inputs[0]) == parse('6 / ( 3 - 1 )')
+	for candidate in candidates:
+		node = parse(candidate.get_raw_input())
+		assert node is not None and candidate.categories == ['complex']
+		if candidate.get_reference() is None:
+			with pytest.raises(MathError):
+				evaluate(node)
+		else:
+			assert str(evaluate(node)) == candidate.get_reference()
+	# Division by zero is kept as a test expecting math error.
+	assert any(candidate.get_reference() is None for candidate in candidates)
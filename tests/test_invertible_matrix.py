@@ -0,0 +1,22 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+import testsuites.invertible_matrix as invertible_matrix
+
+# Module-level helpers of the suite are private.
+reduce_indices = getattr(invertible_matrix, '__reduce_indices')
+
+def test_reduce_indices_as_delta_debugging():
+	assert reduce_indices(1) == []
+	assert reduce_indices(2) == [[0], [1]]
+	assert reduce_indices(4) == [[0, 1], [2, 3], [0], [1], [2], [3], [1, 2, 3], [0, 2, 3], [0, 1, 3], [0, 1, 2]]
+
+	n = 1000
+	reduced = reduce_indices(n)
+	# Each chunk and its complement for 2, 4 and 8 chunks, without repeats (complements of 2 chunks are the chunks themselves).
+	assert len(reduced) == 2 + 2 * 4 + 2 * 8
+	assert len(set(map(tuple, reduced))) == len(reduced)
+	for indices in reduced:
+		assert 0 < len(indices) < n and indices == sorted(set(indices)) and indices[-1] < n
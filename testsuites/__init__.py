@@ -1,7 +1,18 @@
-from .base import BaseTester
+import importlib
 
-from .sum import get_instance
-from .invertible_matrix import get_instance
-from .sprintf import get_instance
-from .expression import get_instance
-from .png import get_instance
+from typing import Dict, Tuple, Optional
+
+from .base import BaseTester, BaseSuiteOptions
+
+# Suite name -> module implementing it. Modules (and numpy/PIL with them) are imported only when the suite is selected.
+SUITES: Dict[str, str] = {
+	'sum': '.sum',
+	'invertible-matrix': '.invertible_matrix',
+	'sprintf': '.sprintf',
+	'expression': '.expression',
+	'png': '.png'
+}
+
+def get_instance(suite: str, options: Optional[BaseSuiteOptions] = None) -> Tuple[BaseTester, Optional[Dict[str, float]]]:
+	module = importlib.import_module(SUITES[suite], __name__)
+	return module.get_instance(options)
@@ -1,13 +1,25 @@
 import os
+import asyncio
+import contextlib
+import hashlib
+import io
+import itertools
+import json
+import math
+import mmap
+import select
+import statistics
 import subprocess
 import time
-import wget
-import zipfile
-import tarfile
+import shutil
+import signal
 import sys
+import tempfile
+import threading
 
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
-from typing import List, Union, Tuple, Optional, Dict, Iterable, Set, Callable
+from typing import List, Union, Tuple, Optional, Dict, Iterable, Iterator, Set, Callable, ContextManager, TextIO
 
 TESTDATA_DIR = 'testdata'
 
@@ -26,8 +38,81 @@ class Errno(Enum):
 	ERROR_FILE_RECREATED_ON_ERROR = 'file was recreated (as empty or with undefined state) after failing'
 	ERROR_TYPE_ERROR = 'type casting error'
 	ERROR_NO_NEWLINE = 'no newline at EOF'
+	ERROR_SKIPPED = 'skipped'
+	ERROR_MEMORY_LIMIT = 'memory limit exceeded'
+	ERROR_CRASH_MEMORY_LIMIT = 'crashed (possibly memory limit)'
+	ERROR_CPU_LIMIT = 'CPU time limit exceeded'
+	ERROR_FILE_SIZE_LIMIT = 'file size limit exceeded'
+	ERROR_OUTPUT_LIMIT = 'output limit exceeded'
 	ERROR_UNKNOWN = 'unknown'
 
+# Contents of test's files for one run, shared by comparison and report. Files up to `TEXT_LIMIT` characters are read once
+# and compared in memory, larger ones are compared line by line from disk, and only their beginning is kept for the report.
+class BaseArtifacts:
+	TEXT_LIMIT = 16 << 20
+
+	def __init__(self, test: 'BaseTest'):
+		self.__test = test
+		# Text (None, if there is no file) and whether it is complete, by name.
+		self.__contents: Dict[str, Tuple[Optional[str], bool]] = {}
+
+	def get_input(self) -> str:
+		if 'input' not in self.__contents:
+			self.__contents['input'] = (self.__test.get_input(), True)
+		return self.__contents['input'][0]
+
+	def get_reference(self) -> Optional[str]:
+		path = self.__test.get_reference_file()
+		if path is None:
+			if 'reference' not in self.__contents:
+				self.__contents['reference'] = (self.__test.get_reference(), True)
+			return self.__contents['reference'][0]
+		return self.__report_text('reference', path)
+
+	def get_output(self) -> Optional[str]:
+		path = self.__test.get_output_stream()
+		return None if path is None else self.__report_text('output', path)
+
+	def get_reference_lines(self) -> Optional['BaseLines']:
+		path = self.__test.get_reference_file()
+		return None if path is None else self.__lines('reference', path)
+
+	# None, if the program has not created its output file.
+	def get_output_lines(self) -> Optional['BaseLines']:
+		path = self.__test.get_output_stream()
+		return None if path is None else self.__lines('output', path)
+
+	# Contents are read again on the next request.
+	def release(self):
+		self.__contents.clear()
+
+	def __lines(self, name: str, path: str) -> Optional['BaseLines']:
+		text, complete = self.__read(name, path)
+		if text is None:
+			return None
+		return BaseLines(text = text) if complete else BaseLines(path = path)
+
+	def __report_text(self, name: str, path: str) -> Optional[str]:
+		text, complete = self.__read(name, path)
+		if text is None or complete:
+			return text
+		return self.truncated(text, "%s is longer than %d characters" % (path, self.TEXT_LIMIT))
+
+	# Beginning of a long text, as it is reported.
+	@staticmethod
+	def truncated(text: str, reason: str) -> str:
+		return text + "\n<truncated: %s>" % (reason)
+
+	def __read(self, name: str, path: str) -> Tuple[Optional[str], bool]:
+		if name not in self.__contents:
+			if not os.path.exists(path):
+				self.__contents[name] = (None, True)
+			else:
+				with open(path, 'r') as file:
+					text = file.read(self.TEXT_LIMIT + 1)
+				self.__contents[name] = (text[:self.TEXT_LIMIT], len(text) <= self.TEXT_LIMIT)
+		return self.__contents[name]
+
 class BaseTestingType(Enum):
 	T_TEXT = "text",
 	T_BINARY = "bytes",
@@ -44,8 +129,30 @@ class BaseResult:
 		self.exitcode = exitcode
 		self.timer = timer
 
+		# Resources used by the program (None, if they were not measured or are not available on this platform).
+		self.wall_time_ns: Optional[int] = None
+		self.cpu_user_time: Optional[float] = None
+		self.cpu_system_time: Optional[float] = None
+		self.peak_rss: Optional[int] = None
+
+		# Wall times (ns) of measured repetitions in benchmark mode.
+		self.samples: List[int] = []
+
 		self.testing_type = testing_type
 
+		# Lines to be printed together with the verdict (e.g. dumped STDERR).
+		self.log: List[str] = []
+
+		# Contents of test's files read during the run (see `BaseArtifacts`), reused by the report.
+		self.artifacts: Optional['BaseArtifacts'] = None
+
+	# Drops texts kept for the report, when nothing reads them after the result is reported.
+	def release(self):
+		self.output = None
+		self.stderr = None
+		if self.artifacts is not None:
+			self.artifacts.release()
+
 	def get_verdict(self) -> str:
 		return self.__errno.value
 
@@ -58,6 +165,21 @@ class BaseResult:
 		else:
 			return "   Verdict: %s.\n   Additional information: %s." % (self.__errno.value, self.__what)
 
+	# Restores result from its JSON report entry (see `BaseSuite.json_result`).
+	@staticmethod
+	def from_json(json_result: dict, testing_type: BaseTestingType) -> 'BaseResult':
+		result = BaseResult(Errno(json_result['verdict']), exitcode = json_result['exitcode'], timer = json_result['time'], what = json_result.get('verdict_additional_info'), testing_type = testing_type)
+		result.output = '' if json_result['output'] == '<no output>' else json_result['output']
+		result.stderr = '' if json_result['stderr'] == '<no error output>' else json_result['stderr']
+		result.wall_time_ns = json_result.get('wall_time_ns')
+		result.cpu_user_time = json_result.get('cpu_user_time')
+		result.cpu_system_time = json_result.get('cpu_system_time')
+		result.peak_rss = json_result.get('peak_rss')
+		return result
+
+	def get_errno(self) -> Errno:
+		return self.__errno
+
 	def ok(self) -> bool:
 		return self.__errno == Errno.ERROR_SUCCESS
 
@@ -88,6 +210,10 @@ def make_suite_dirname(suite: str) -> str:
 	return p
 
 def download_and_release(suite: str, tag: str = 'latest'):
+	import wget
+	import zipfile
+	import tarfile
+
 	URL_ORGANIZATION = 'se-c-cpp-prog'
 	URL_REPOSITORY = 'public-tests'
 
@@ -105,6 +231,71 @@ def download_and_release(suite: str, tag: str = 'latest'):
 
 	os.remove(output)
 
+# Options affecting how suites generate their tests.
+class BaseSuiteOptions:
+	def __init__(self, stress: bool = False, fuzz: int = 0, fuzz_depth: int = 4, seed: int = 0):
+		# Add (slow) stress tests, where suite supports them.
+		self.stress = stress
+		# Add this number of randomly generated tests (with depth limited by `fuzz_depth`), where suite supports them.
+		self.fuzz = fuzz
+		self.fuzz_depth = fuzz_depth
+		# Seed of all random generation, the same seed gives the same tests.
+		self.seed = seed
+
+# Generated fixtures of a suite, stored under its testdata directory and keyed by the generator parameters and source code.
+class BaseFixtureCache:
+	def __init__(self, suite_dir: str, params: Dict[str, object], sources: Iterable[str]):
+		self.__path = os.path.join(suite_dir, 'fixtures.json')
+
+		digest = hashlib.sha256(json.dumps(params, sort_keys = True).encode())
+		for source in sources:
+			with open(source, 'rb') as file:
+				digest.update(file.read())
+		self.__key = digest.hexdigest()
+
+	# Returns None, if fixtures should be (re)generated.
+	# Otherwise, returns fixtures as they were stored (tuples become lists).
+	def load(self) -> Optional[object]:
+		try:
+			with open(self.__path, 'r') as file:
+				manifest = json.load(file)
+		except (OSError, ValueError):
+			return None
+
+		# Manifest of another shape (written by hand or by another version) is stale as well.
+		try:
+			if manifest['key'] == self.__key and all(os.path.isfile(f) and self.__digest(f) == digest for f, digest in manifest['files'].items()):
+				return manifest['fixtures']
+		except (KeyError, TypeError, AttributeError):
+			pass
+
+		# Stale manifest should not survive an interrupted regeneration.
+		try:
+			os.remove(self.__path)
+		except OSError:
+			pass
+		return None
+
+	def store(self, fixtures: object, files: Iterable[str]):
+		manifest = { 'key': self.__key, 'fixtures': fixtures, 'files': { f: self.__digest(f) for f in files } }
+		tmp_path = self.__path + '.tmp'
+		with open(tmp_path, 'w') as file:
+			json.dump(manifest, file)
+		os.replace(tmp_path, self.__path)
+
+	# Fixture edited in place may keep its size, so its contents are compared.
+	@staticmethod
+	def __digest(path: str) -> str:
+		digest = hashlib.sha256()
+		with open(path, 'rb') as file:
+			for chunk in iter(lambda: file.read(1 << 20), b''):
+				digest.update(chunk)
+		return digest.hexdigest()
+
+# Categories are grouped by their first word: '16to10 extended' belongs to the group '16to10'.
+def get_category_group(category: str) -> str:
+	return category.split(' ', 1)[0]
+
 def escape_envname(name: str) -> str:
 	s = ''
 	for c in name:
@@ -208,6 +399,12 @@ def err_assertion_pos(i: int, j: int, actual: str, expected: str) -> BaseResult:
 def err_assertion_len(actual_len: int, expected_len: int) -> BaseResult:
 	return BaseResult(Errno.ERROR_ASSERTION, what = "the number of rows in the actual solution (%d) does not match the number of rows in the expected solution (%d)" % (actual_len, expected_len))
 
+def err_assertion_size(actual_size: int, expected_size: int) -> BaseResult:
+	return BaseResult(Errno.ERROR_ASSERTION, what = "the size of the actual output (%d bytes) does not match the size of the expected output (%d bytes)" % (actual_size, expected_size))
+
+def err_assertion_offset(offset: int, actual: str, expected: str) -> BaseResult:
+	return BaseResult(Errno.ERROR_ASSERTION, what = "contents differ at offset %d (0x%x): expected %s, but actual is %s" % (offset, offset, expected, actual))
+
 def err_file_not_found(file: str) -> BaseResult:
 	return BaseResult(Errno.ERROR_FILE_NOT_FOUND, what = "file \"%s\" should be created after running program" % (file))
 
@@ -223,12 +420,568 @@ def err_type_error(i: int, j: int, type_error_message: str) -> BaseResult:
 def err_no_newline() -> BaseResult:
 	return BaseResult(Errno.ERROR_NO_NEWLINE)
 
+def err_skipped(reason: str) -> BaseResult:
+	return BaseResult(Errno.ERROR_SKIPPED, exitcode = None, timer = 0, what = reason)
+
+def err_memory_limit(limit: int) -> BaseResult:
+	return BaseResult(Errno.ERROR_MEMORY_LIMIT, what = "limit is %d bytes" % (limit))
+
+def err_crash_memory_limit(signum: int, limit: int, peak_rss: Optional[int]) -> BaseResult:
+	what = "killed by signal %d, memory limit is %d bytes" % (signum, limit)
+	if peak_rss is not None:
+		what += ", peak RSS is %d bytes" % (peak_rss)
+	return BaseResult(Errno.ERROR_CRASH_MEMORY_LIMIT, what = what)
+
+def err_cpu_limit(limit: int) -> BaseResult:
+	return BaseResult(Errno.ERROR_CPU_LIMIT, what = "limit is %d seconds" % (limit))
+
+def err_file_size_limit(limit: int) -> BaseResult:
+	return BaseResult(Errno.ERROR_FILE_SIZE_LIMIT, what = "limit is %d bytes" % (limit))
+
+def err_output_limit(limit: int) -> BaseResult:
+	return BaseResult(Errno.ERROR_OUTPUT_LIMIT, what = "limit is %d bytes" % (limit))
+
 def err_unknown(what: str) -> BaseResult:
 	return BaseResult(Errno.ERROR_UNKNOWN, what = escape(what))
 
+def dump_stderr(log: List[str], stderr: str):
+	# For sanitizers.
+	if not (stderr == "" or stderr is None):
+		log.append('       STDERR -->')
+		log.append(stderr)
+		log.append('   <-- STDERR')
+
 def get_time() -> int:
 	return time.time_ns() // 1000000
 
+# Output stream of the program: kept in memory up to the limit, the rest is spilled into a temporary file.
+class BaseCapture:
+	MEMORY_LIMIT = 16 * 1024 * 1024
+
+	def __init__(self, memory_limit: int = MEMORY_LIMIT):
+		self.__file = tempfile.SpooledTemporaryFile(max_size = memory_limit)
+		self.memory_limit = memory_limit
+		self.size = 0
+
+	def write(self, data: bytes):
+		self.__file.write(data)
+		self.size += len(data)
+
+	# Beginning of the output (at most `limit` bytes) and whether it is the whole output.
+	def read(self, limit: int) -> Tuple[bytes, bool]:
+		self.__file.seek(0)
+		return self.__file.read(limit), self.size <= limit
+
+	# Whole output as text (decoded as by `decode_output`), read lazily.
+	@contextlib.contextmanager
+	def open_text(self) -> Iterator[TextIO]:
+		self.__file.seek(0)
+		text = io.TextIOWrapper(self.__file, encoding = 'utf-8', errors = 'replace', newline = None)
+		try:
+			yield text
+		finally:
+			# The capture stays open for the next reader.
+			text.detach()
+
+	def close(self):
+		self.__file.close()
+
+# Outcome of a single program execution.
+class BaseExecution:
+	# Seconds to wait for the rest of output after the program is killed.
+	DRAIN_TIMEOUT = 1.0
+
+	def __init__(self, stdout_capture: Optional[BaseCapture] = None, stderr_capture: Optional[BaseCapture] = None):
+		# Output is decoded only, when its text is needed, and only up to the capture's memory limit.
+		self.__captures = { 'stdout': stdout_capture, 'stderr': stderr_capture }
+		self.__texts: Dict[str, Optional[str]] = { 'stdout': None, 'stderr': None }
+		self.__complete = { 'stdout': True, 'stderr': True }
+		self.returncode: Optional[int] = None
+		self.timed_out = False
+		# Verdict, if program was stopped by one of sandbox's limits.
+		self.limit_result: Optional[BaseResult] = None
+
+		self.wall_time_ns = 0
+		self.cpu_user_time: Optional[float] = None
+		self.cpu_system_time: Optional[float] = None
+		self.peak_rss: Optional[int] = None
+
+	@property
+	def stdout(self) -> Optional[str]:
+		return self.__text('stdout')
+
+	@stdout.setter
+	def stdout(self, text: Optional[str]):
+		self.__texts['stdout'] = text
+
+	@property
+	def stderr(self) -> Optional[str]:
+		return self.__text('stderr')
+
+	@stderr.setter
+	def stderr(self, text: Optional[str]):
+		self.__texts['stderr'] = text
+
+	# Lines of the whole output: decoded text, if it is complete, otherwise lines are read from the capture.
+	def lines(self, name: str) -> 'BaseLines':
+		text = self.__text(name)
+		if self.__complete[name]:
+			return BaseLines(text = text)
+		return BaseLines(capture = self.__captures[name])
+
+	# Text of the output for the report, with a note, if it is not complete.
+	def report_text(self, name: str) -> Optional[str]:
+		text = self.__text(name)
+		if self.__complete[name]:
+			return text
+		return BaseArtifacts.truncated(text, "%s is longer than %d bytes" % (name, self.__captures[name].memory_limit))
+
+	def close(self):
+		for name, capture in self.__captures.items():
+			if capture is not None:
+				capture.close()
+				self.__captures[name] = None
+
+	def __text(self, name: str) -> Optional[str]:
+		capture = self.__captures[name]
+		if self.__texts[name] is None and capture is not None:
+			data, self.__complete[name] = capture.read(capture.memory_limit)
+			self.__texts[name] = decode_output(data)
+		return self.__texts[name]
+
+	def account(self, result: BaseResult):
+		result.timer = self.wall_time_ns // 1000000
+		result.wall_time_ns = self.wall_time_ns
+		result.cpu_user_time = self.cpu_user_time
+		result.cpu_system_time = self.cpu_system_time
+		result.peak_rss = self.peak_rss
+
+# Resource limits and isolated working directories for the program under test. Limits are applied on POSIX only.
+class BaseSandbox:
+	# Failed program has exceeded its memory limit, if it has reported failed allocation. There is no way to learn from outside,
+	# that its allocation has failed, so crash by one of these signals is reported only as possible exceeding of the limit.
+	ALLOCATION_FAILURES = ['bad_alloc', 'MemoryError', 'Cannot allocate memory', 'out of memory']
+	CRASH_SIGNALS = [getattr(signal, name) for name in ['SIGSEGV', 'SIGBUS', 'SIGABRT'] if hasattr(signal, name)]
+
+	def __init__(self, memory_limit: int = 0, cpu_limit: int = 0, file_size_limit: int = 0, output_limit: int = 0, capture_limit: int = BaseCapture.MEMORY_LIMIT, isolate: bool = False):
+		# Limits of address space (bytes), CPU time (seconds) and size of written files (bytes), 0 - no limit.
+		self.memory_limit = memory_limit
+		self.cpu_limit = cpu_limit
+		self.file_size_limit = file_size_limit
+		# Program is killed, when its stdout and stderr together exceed this number of bytes (0 - no limit).
+		self.output_limit = output_limit
+		# Bytes of each output stream kept in memory, the rest is spilled to disk.
+		self.capture_limit = capture_limit
+
+		# Each test runs in its own temporary working directory (in memory, if possible).
+		self.isolate = isolate
+		self.__tmp_root = '/dev/shm' if os.path.isdir('/dev/shm') and os.access('/dev/shm', os.W_OK) else None
+
+		# Limits are set by `prlimit` utility (Linux) or by `ulimit` of the shell, which then executes the program: no Python code
+		# may run in the child between fork and exec, as runs are started from many threads.
+		self.__limits: List[Tuple[str, str, int, int, int]] = []
+		self.__prlimit: Optional[str] = None
+		if not is_windows():
+			import resource
+			self.__prlimit = shutil.which('prlimit')
+			# Option of `prlimit`, option of `ulimit` and its unit in bytes (or seconds).
+			for resource_id, option, ulimit_option, unit, soft in [
+				(resource.RLIMIT_AS, 'as', '-v', 1024, memory_limit),
+				(resource.RLIMIT_CPU, 'cpu', '-t', 1, cpu_limit),
+				(resource.RLIMIT_FSIZE, 'fsize', '-f', 512, file_size_limit)
+			]:
+				if soft == 0:
+					continue
+				# CPU time limit is soft: SIGXCPU first, SIGKILL a second later.
+				hard = soft + 1 if resource_id == resource.RLIMIT_CPU else soft
+				current_hard = resource.getrlimit(resource_id)[1]
+				if current_hard != resource.RLIM_INFINITY:
+					soft, hard = min(soft, current_hard), min(hard, current_hard)
+				self.__limits.append((option, ulimit_option, unit, soft, hard))
+
+	# Whether runs are restricted anyhow (otherwise only capturing of output is configured).
+	def is_restricted(self) -> bool:
+		return self.isolate or self.memory_limit > 0 or self.cpu_limit > 0 or self.file_size_limit > 0 or self.output_limit > 0
+
+	# Command line, which runs the program with the limits applied.
+	def wrap(self, args: List[str]) -> List[str]:
+		if len(self.__limits) == 0:
+			return args
+		if self.__prlimit is not None:
+			return [self.__prlimit] + ['--%s=%d:%d' % (option, soft, hard) for option, _, _, soft, hard in self.__limits] + ['--'] + args
+		# Shell's units are coarser, limits are rounded up. Soft limit goes first, as hard one may not be set below it.
+		commands = []
+		for _, ulimit_option, unit, soft, hard in self.__limits:
+			commands.append('ulimit -S %s %d' % (ulimit_option, -(-soft // unit)))
+			commands.append('ulimit -H %s %d' % (ulimit_option, -(-hard // unit)))
+		return ['/bin/sh', '-c', ' && '.join(commands) + ' && exec "$@"', 'sh'] + args
+
+	def check_limits(self, execution: BaseExecution) -> Optional[BaseResult]:
+		if is_windows() or execution.returncode is None:
+			return None
+		returncode = execution.returncode
+		cpu_time = (execution.cpu_user_time or 0.0) + (execution.cpu_system_time or 0.0)
+		if self.cpu_limit > 0 and (returncode == -signal.SIGXCPU or (returncode == -signal.SIGKILL and cpu_time >= self.cpu_limit)):
+			return err_cpu_limit(self.cpu_limit)
+		if self.file_size_limit > 0 and returncode == -signal.SIGXFSZ:
+			return err_file_size_limit(self.file_size_limit)
+		# Nonzero exit code alone may be expected by the test. Limit is known to be exceeded, only when allocator's failure is reported.
+		if self.memory_limit > 0 and returncode != 0:
+			if execution.stderr is not None and any(failure in execution.stderr for failure in self.ALLOCATION_FAILURES):
+				return err_memory_limit(self.memory_limit)
+			# Program, which got no memory from `malloc`, usually crashes right away, but so does a program with any other bug.
+			if -returncode in self.CRASH_SIGNALS:
+				return err_crash_memory_limit(-returncode, self.memory_limit, execution.peak_rss)
+		return None
+
+	# Arguments and working directory of isolated run: output file is written into the working directory and then moved to
+	# `output_stream`, paths to test data are made absolute.
+	@contextlib.contextmanager
+	def isolated(self, args: List[str], output_stream: Optional[str]) -> Iterator[Tuple[List[str], Optional[str]]]:
+		if not self.isolate:
+			yield args, None
+			return
+
+		workdir = tempfile.mkdtemp(prefix = 'test_', dir = self.__tmp_root)
+		try:
+			sandboxed_output = None if output_stream is None else os.path.join(workdir, os.path.basename(output_stream))
+			sandboxed_args = args[:1]
+			for arg in args[1:]:
+				if output_stream is not None and arg == output_stream:
+					sandboxed_args.append(sandboxed_output)
+				elif arg == TESTDATA_DIR or arg.startswith(TESTDATA_DIR + os.sep):
+					sandboxed_args.append(os.path.abspath(arg))
+				else:
+					sandboxed_args.append(arg)
+
+			yield sandboxed_args, workdir
+
+			if output_stream is not None:
+				if os.path.exists(sandboxed_output):
+					shutil.move(sandboxed_output, output_stream)
+				elif os.path.exists(output_stream):
+					os.remove(output_stream)
+		finally:
+			shutil.rmtree(workdir, ignore_errors = True)
+
+	def execute(self, args: List[str], input: Optional[str], timeout: float, output_stream: Optional[str]) -> BaseExecution:
+		with self.isolated(args, output_stream) as (sandboxed_args, cwd):
+			return execute(sandboxed_args, input, timeout, self, cwd)
+
+	async def execute_async(self, args: List[str], input: Optional[str], timeout: float, output_stream: Optional[str]) -> BaseExecution:
+		with self.isolated(args, output_stream) as (sandboxed_args, cwd):
+			return await execute_async(sandboxed_args, input, timeout, self, cwd)
+
+# Output of the program as text: same newline translation as for text streams.
+def decode_output(data: bytes) -> str:
+	return data.decode(errors = 'replace').replace('\r\n', '\n').replace('\r', '\n')
+
+# Both output streams of a run. When they exceed the sandbox's output limit together, the program is killed and the rest of output is dropped.
+class BaseCapturedOutput:
+	def __init__(self, sandbox: Optional[BaseSandbox], kill: Callable[[], None]):
+		capture_limit = sandbox.capture_limit if sandbox is not None else BaseCapture.MEMORY_LIMIT
+		self.limit = sandbox.output_limit if sandbox is not None else 0
+		self.captures = { 'stdout': BaseCapture(capture_limit), 'stderr': BaseCapture(capture_limit) }
+		self.exceeded = False
+		self.__kill = kill
+		self.__lock = threading.Lock()
+
+	# Returns False, if the rest of output should not be read.
+	def write(self, name: str, data: bytes) -> bool:
+		with self.__lock:
+			if self.exceeded:
+				return False
+			size = self.captures['stdout'].size + self.captures['stderr'].size
+			if self.limit > 0 and size + len(data) > self.limit:
+				self.captures[name].write(data[:self.limit - size])
+				self.exceeded = True
+				self.__kill()
+				return False
+			self.captures[name].write(data)
+			return True
+
+	def make_execution(self) -> 'BaseExecution':
+		return BaseExecution(self.captures['stdout'], self.captures['stderr'])
+
+# Kills the program with all processes started by it (they are in its own session or process group).
+def kill_process_tree(pid: int):
+	try:
+		if is_windows():
+			subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+		else:
+			os.killpg(pid, signal.SIGKILL)
+	except OSError:
+		pass
+
+def execute(args: List[str], input: Optional[str], timeout: float, sandbox: Optional[BaseSandbox] = None, cwd: Optional[str] = None) -> BaseExecution:
+	# On POSIX the exit is observed without reaping (so pid can't be reused while it's being killed), then the process is reaped by `wait4` with its resource usage.
+	posix = hasattr(os, 'wait4') and hasattr(os, 'waitid')
+	exited: List[int] = []
+
+	start = time.perf_counter_ns()
+	proc = subprocess.Popen(
+		sandbox.wrap(args) if sandbox is not None else args, stdin = subprocess.PIPE, stdout = subprocess.PIPE, stderr = subprocess.PIPE, cwd = cwd,
+		start_new_session = not is_windows(), creationflags = subprocess.CREATE_NEW_PROCESS_GROUP if is_windows() else 0
+	)
+	# Output is collected by chunks, so that it's known even if the program is killed.
+	output = BaseCapturedOutput(sandbox, lambda: kill_process_tree(proc.pid))
+	execution = output.make_execution()
+
+	def wait():
+		if posix:
+			os.waitid(os.P_PID, proc.pid, os.WEXITED | os.WNOWAIT)
+		else:
+			proc.wait()
+		exited.append(time.perf_counter_ns())
+
+	def write():
+		try:
+			if input:
+				proc.stdin.write(input.replace('\n', os.linesep).encode())
+			proc.stdin.close()
+		except OSError:
+			pass
+
+	def read(name: str, stream):
+		with stream:
+			while True:
+				chunk = os.read(stream.fileno(), 65536)
+				if not chunk or not output.write(name, chunk):
+					break
+
+	waiter = threading.Thread(target = wait, daemon = True)
+	readers = [
+		threading.Thread(target = read, args = ('stdout', proc.stdout), daemon = True),
+		threading.Thread(target = read, args = ('stderr', proc.stderr), daemon = True)
+	]
+	threads = [waiter, threading.Thread(target = write, daemon = True)] + readers
+	for thread in threads:
+		thread.start()
+
+	# As with `communicate`, the program is done when it has exited and closed its output. On POSIX processes left by the program
+	# are killed after its exit, so only the exit is awaited.
+	deadline = start + int(timeout * 1000000000)
+	for thread in [waiter] if posix else threads:
+		thread.join(max(0, deadline - time.perf_counter_ns()) / 1000000000)
+	execution.timed_out = waiter.is_alive() or (not posix and any(thread.is_alive() for thread in threads))
+	execution.wall_time_ns = time.perf_counter_ns() - start if execution.timed_out else exited[0] - start
+
+	if posix or execution.timed_out:
+		kill_process_tree(proc.pid)
+	waiter.join()
+
+	# Killed processes close the pipes and the rest of output is read, unless some process has left the session.
+	for reader in readers:
+		reader.join(BaseExecution.DRAIN_TIMEOUT)
+	if any(reader.is_alive() for reader in readers):
+		execution.timed_out = True
+
+	if posix:
+		_, status, rusage = os.wait4(proc.pid, 0)
+		proc.returncode = os.waitstatus_to_exitcode(status)
+		execution.cpu_user_time = rusage.ru_utime
+		execution.cpu_system_time = rusage.ru_stime
+		# Kilobytes on Linux, bytes on macOS.
+		execution.peak_rss = rusage.ru_maxrss if sys.platform == 'darwin' else rusage.ru_maxrss * 1024
+
+	execution.returncode = proc.returncode
+	if output.exceeded:
+		execution.limit_result = err_output_limit(output.limit)
+	elif sandbox is not None and not execution.timed_out:
+		execution.limit_result = sandbox.check_limits(execution)
+	return execution
+
+# Collects output of the program run by event loop and notes the moment of its exit.
+class __ExecutionProtocol(asyncio.SubprocessProtocol):
+	def __init__(self, loop: asyncio.AbstractEventLoop, sandbox: Optional[BaseSandbox]):
+		self.output = BaseCapturedOutput(sandbox, lambda: kill_process_tree(self.transport.get_pid()))
+		self.exited: asyncio.Future = loop.create_future()
+		self.closed: asyncio.Future = loop.create_future()
+
+	def connection_made(self, transport: asyncio.SubprocessTransport):
+		self.transport = transport
+
+	def pipe_data_received(self, fd: int, data: bytes):
+		self.output.write('stdout' if fd == 1 else 'stderr', data)
+
+	def process_exited(self):
+		self.exited.set_result(time.perf_counter_ns())
+
+	# Both the process has exited and all its pipes are closed.
+	def connection_lost(self, exc: Optional[Exception]):
+		if not self.closed.done():
+			self.closed.set_result(None)
+
+# Same as `execute`, but many runs can be awaited at once without threads per pipe. Event loop reaps the process itself,
+# so resource usage is not measured.
+async def execute_async(args: List[str], input: Optional[str], timeout: float, sandbox: Optional[BaseSandbox] = None, cwd: Optional[str] = None) -> BaseExecution:
+	loop = asyncio.get_running_loop()
+
+	start = time.perf_counter_ns()
+	transport, protocol = await loop.subprocess_exec(
+		lambda: __ExecutionProtocol(loop, sandbox), *(sandbox.wrap(args) if sandbox is not None else args), stdin = subprocess.PIPE, stdout = subprocess.PIPE, stderr = subprocess.PIPE, cwd = cwd,
+		start_new_session = not is_windows(), creationflags = subprocess.CREATE_NEW_PROCESS_GROUP if is_windows() else 0
+	)
+	execution = protocol.output.make_execution()
+	try:
+		stdin = transport.get_pipe_transport(0)
+		if input:
+			stdin.write(input.replace('\n', os.linesep).encode())
+		stdin.close()
+
+		try:
+			exited = await asyncio.wait_for(asyncio.shield(protocol.exited), timeout)
+			execution.wall_time_ns = exited - start
+		except asyncio.TimeoutError:
+			execution.timed_out = True
+			execution.wall_time_ns = time.perf_counter_ns() - start
+
+		# Whole tree is killed: the program itself on timeout, processes left by it in any case.
+		if not is_windows() or execution.timed_out:
+			kill_process_tree(transport.get_pid())
+		await protocol.exited
+
+		# Killed processes close the pipes and the rest of output is received, unless some process has left the session.
+		try:
+			await asyncio.wait_for(asyncio.shield(protocol.closed), BaseExecution.DRAIN_TIMEOUT)
+		except asyncio.TimeoutError:
+			execution.timed_out = True
+	finally:
+		transport.close()
+
+	execution.returncode = transport.get_returncode()
+	if protocol.output.exceeded:
+		execution.limit_result = err_output_limit(protocol.output.limit)
+	elif sandbox is not None and not execution.timed_out:
+		execution.limit_result = sandbox.check_limits(execution)
+	return execution
+
+# Long-lived program in batch mode: tests are passed through its stdin one by one instead of spawning a process per test.
+# Protocol (program is started as `program --batch`):
+#   request:  "<argc>\n", then for each argument "<length in bytes>\n<argument>\n";
+#   response: "<exitcode> <stdout length> <stderr length>\n<stdout><stderr>".
+# On crash, timeout or malformed response the process is killed and the test should be run in its own process.
+class BaseBatchSession:
+	# Batch mode is given up after this number of broken processes.
+	MAX_FAILURES = 3
+	# Time given to the program to exit after its stdin is closed.
+	CLOSE_TIMEOUT_NS = 1000000000
+
+	def __init__(self, program: str):
+		self.__program = program
+		self.__proc: Optional[subprocess.Popen] = None
+		self.__buffer = b''
+		self.__answered = 0
+		# There is no way to wait for pipe with timeout on Windows.
+		self.__failures = self.MAX_FAILURES if is_windows() else 0
+
+	# Returns None, if test should be run in its own process.
+	def execute(self, args: List[str], timeout: float) -> Optional[BaseExecution]:
+		if self.__failures >= self.MAX_FAILURES:
+			return None
+		if self.__proc is None:
+			self.__proc = subprocess.Popen([self.__program, '--batch'], stdin = subprocess.PIPE, stdout = subprocess.PIPE, stderr = subprocess.DEVNULL, start_new_session = True)
+			self.__buffer = b''
+
+		request = b'%d\n' % (len(args))
+		for arg in args:
+			encoded = arg.encode()
+			request += b'%d\n%s\n' % (len(encoded), encoded)
+
+		start = time.perf_counter_ns()
+		deadline = start + int(timeout * 1000000000)
+		try:
+			self.__proc.stdin.write(request)
+			self.__proc.stdin.flush()
+			header = self.__read_line(deadline)
+			returncode, stdout_len, stderr_len = (int(x) for x in header.split())
+			stdout = self.__read_exactly(stdout_len, deadline)
+			stderr = self.__read_exactly(stderr_len, deadline)
+		except TimeoutError:
+			# Program, which has answered before, supports batch mode, so the test is not rerun in its own process.
+			if self.__answered == 0:
+				self.__fail()
+				return None
+			kill_process_tree(self.__proc.pid)
+			self.close()
+			execution = BaseExecution()
+			execution.wall_time_ns = time.perf_counter_ns() - start
+			execution.timed_out = True
+			return execution
+		except (OSError, ValueError):
+			self.__fail()
+			return None
+
+		execution = BaseExecution()
+		execution.wall_time_ns = time.perf_counter_ns() - start
+		execution.returncode = returncode
+		execution.stdout = decode_output(stdout)
+		execution.stderr = decode_output(stderr)
+		self.__answered += 1
+		return execution
+
+	def close(self):
+		if self.__proc is None:
+			return
+		try:
+			self.__proc.stdin.close()
+		except OSError:
+			pass
+		# Exit is awaited without reaping, so that processes left by the program are killed by still reserved group id.
+		if hasattr(os, 'waitid'):
+			deadline = time.perf_counter_ns() + self.CLOSE_TIMEOUT_NS
+			while os.waitid(os.P_PID, self.__proc.pid, os.WEXITED | os.WNOWAIT | os.WNOHANG) is None and time.perf_counter_ns() < deadline:
+				time.sleep(0.01)
+		else:
+			try:
+				self.__proc.wait(self.CLOSE_TIMEOUT_NS / 1000000000)
+			except subprocess.TimeoutExpired:
+				pass
+		kill_process_tree(self.__proc.pid)
+		self.__proc.wait()
+		self.__proc.stdout.close()
+		self.__proc = None
+
+	def __fail(self):
+		# Program, which breaks before its first answer (in any of its processes), doesn't support batch mode at all.
+		self.__failures = self.MAX_FAILURES if self.__answered == 0 else self.__failures + 1
+		kill_process_tree(self.__proc.pid)
+		self.close()
+
+	def __fill(self, deadline: int):
+		timeout = max(0, deadline - time.perf_counter_ns()) / 1000000000
+		fd = self.__proc.stdout.fileno()
+		if not select.select([fd], [], [], timeout)[0]:
+			raise TimeoutError('batch program timed out')
+		chunk = os.read(fd, 65536)
+		if not chunk:
+			raise ValueError('batch program closed its output')
+		self.__buffer += chunk
+
+	def __read_line(self, deadline: int) -> bytes:
+		while b'\n' not in self.__buffer:
+			self.__fill(deadline)
+		line, _, self.__buffer = self.__buffer.partition(b'\n')
+		return line
+
+	def __read_exactly(self, size: int, deadline: int) -> bytes:
+		if size < 0:
+			raise ValueError('negative length in batch response')
+		while len(self.__buffer) < size:
+			self.__fill(deadline)
+		data, self.__buffer = self.__buffer[:size], self.__buffer[size:]
+		return data
+
+def timing_statistics(samples: Iterable[int]) -> Dict[str, float]:
+	ms = sorted(sample / 1000000 for sample in samples)
+	return {
+		'runs': len(ms),
+		'min': ms[0],
+		'median': statistics.median(ms),
+		'p95': ms[math.ceil(0.95 * len(ms)) - 1],
+		'stddev': statistics.stdev(ms) if len(ms) > 1 else 0.0
+	}
+
 def basic_compare_fn(actual: str, expected: str) -> bool:
 	# Compare.
 	return actual == expected
@@ -243,7 +996,71 @@ class BaseMeta:
 
 ContentT = Union[List[str], bytes, BaseMeta]
 
+# Lines of text as `text.split('\n')` gives them: either kept in memory (as list or as whole text) or read lazily from file or
+# captured output (with the same newline translation).
+class BaseLines:
+	# File is counted by chunks of this size.
+	COUNT_CHUNK = 1 << 20
+
+	def __init__(self, lines: Optional[List[str]] = None, path: Optional[str] = None, text: Optional[str] = None, capture: Optional[BaseCapture] = None):
+		if [lines, path, text, capture].count(None) != 3:
+			raise ValueError('[FATAL ERROR] Lines should be given either as list, as text, as path to file or as captured output.')
+		self.__lines = lines
+		self.__text = text
+		self.__open: Optional[Callable[[], ContextManager[TextIO]]] = None
+		if path is not None:
+			self.__open = lambda: open(path, 'r')
+		elif capture is not None:
+			self.__open = capture.open_text
+		self.__count: Optional[int] = None
+		if lines is not None:
+			self.__count = len(lines)
+		elif text is not None:
+			self.__count = text.count('\n') + 1
+
+	def __len__(self) -> int:
+		if self.__count is None:
+			newlines = 0
+			with self.__open() as file:
+				for chunk in iter(lambda: file.read(self.COUNT_CHUNK), ''):
+					newlines += chunk.count('\n')
+			self.__count = newlines + 1
+		return self.__count
+
+	def __iter__(self) -> Iterator[str]:
+		if self.__lines is not None:
+			return iter(self.__lines)
+		if self.__text is not None:
+			return self.__split()
+		return self.__read()
+
+	# Same lines as `text.split('\n')`, without building the list.
+	def __split(self) -> Iterator[str]:
+		text = self.__text
+		start = 0
+		end = text.find('\n')
+		while end != -1:
+			yield text[start:end]
+			start = end + 1
+			end = text.find('\n', start)
+		yield text[start:]
+
+	def __read(self) -> Iterator[str]:
+		last = ''
+		with self.__open() as file:
+			for line in file:
+				if line.endswith('\n'):
+					yield line[:-1]
+				else:
+					last = line
+		# Text after the last newline (empty, if the file ends with newline).
+		yield last
+
 class BaseComparator:
+	# Binary outputs are compared by chunks of this size, first difference is shown with this number of bytes around it.
+	BINARY_CHUNK = 1 << 20
+	BINARY_CONTEXT = 8
+
 	def __init__(self):
 		pass
 
@@ -263,29 +1080,88 @@ class BaseComparator:
 
 		# CASE: fatal assertion.
 		if actual_len != expected_len:
-			return err_assertion_len(actual_len, expected_len)
+			return err_assertion_size(actual_len, expected_len)
 
 		# CASE: assertion.
 		try:
 			if not compare_fn(actual, expected):
-				return BaseResult(Errno.ERROR_ASSERTION, what = f"contents not same")
+				if compare_fn is not basic_compare_bytes_fn:
+					return BaseResult(Errno.ERROR_ASSERTION, what = f"contents not same")
+				offset = self._first_difference(actual, expected, 0, actual_len)
+				return err_assertion_offset(offset, self._hex_context(actual, offset), self._hex_context(expected, offset))
 		except ValueError:
 			return BaseResult(Errno.ERROR_ASSERTION, what = f"contents should be {type_error_message}")
 
 		return err_ok()
 
+	# Compares binary output file with expected one. Files are mapped and compared by chunks, unless comparison of contents is
+	# overridden (then they are read and passed to `compare`).
+	def compare_binary_files(self, actual_file: str, expected_file: str) -> BaseResult:
+		if type(self).compare is not BaseComparator.compare or type(self)._compare_details_bytes is not BaseComparator._compare_details_bytes:
+			with open(actual_file, 'rb') as actual, open(expected_file, 'rb') as expected:
+				return self.compare(actual.read(), expected.read())
+
+		actual_size = os.path.getsize(actual_file)
+		expected_size = os.path.getsize(expected_file)
+
+		# CASE: fatal assertion.
+		if actual_size != expected_size:
+			return err_assertion_size(actual_size, expected_size)
+		# Empty file can't be mapped.
+		if actual_size == 0:
+			return err_ok()
+
+		# CASE: assertion.
+		with open(actual_file, 'rb') as actual_stream, open(expected_file, 'rb') as expected_stream:
+			with mmap.mmap(actual_stream.fileno(), 0, access = mmap.ACCESS_READ) as actual, mmap.mmap(expected_stream.fileno(), 0, access = mmap.ACCESS_READ) as expected:
+				for start in range(0, actual_size, self.BINARY_CHUNK):
+					end = min(start + self.BINARY_CHUNK, actual_size)
+					if actual[start:end] != expected[start:end]:
+						offset = self._first_difference(actual, expected, start, end)
+						return err_assertion_offset(offset, self._hex_context(actual, offset), self._hex_context(expected, offset))
+
+		return err_ok()
+
+	# Offset of the first differing byte in [start, end), where contents are known to differ. Halves are compared instead of single bytes.
+	@staticmethod
+	def _first_difference(actual: Union[bytes, mmap.mmap], expected: Union[bytes, mmap.mmap], start: int, end: int) -> int:
+		while end - start > 64:
+			middle = (start + end) // 2
+			if actual[start:middle] != expected[start:middle]:
+				end = middle
+			else:
+				start = middle
+		for offset in range(start, end):
+			if actual[offset] != expected[offset]:
+				return offset
+		return end
+
+	# Bytes around offset in hex, the byte at offset is bracketed.
+	def _hex_context(self, content: Union[bytes, mmap.mmap], offset: int) -> str:
+		start = max(0, offset - self.BINARY_CONTEXT)
+		window = content[start:offset + self.BINARY_CONTEXT + 1]
+		return ' '.join(('[%02x]' if start + k == offset else '%02x') % (byte) for k, byte in enumerate(window))
+
+	# Compares texts line by line. Lines are iterated in lock-step, so texts are never kept in memory as a whole,
+	# unless comparison of contents is overridden (then lists of lines are passed to `compare`).
+	def compare_lines(self, actual: BaseLines, expected: BaseLines) -> BaseResult:
+		if type(self).compare is not BaseComparator.compare or type(self)._compare_details is not BaseComparator._compare_details:
+			return self.compare(list(actual), list(expected))
+		return self._compare_details_lines(actual, len(actual), expected, len(expected), basic_compare_fn, 'plain text (string)')
+
 	def _compare_details(self, actual: List[str], expected: List[str], compare_fn: Callable[[str, str], bool], type_error_message: str, assertion_message_fn: Callable[[int, int, str, str], BaseResult] = None) -> BaseResult:
-		actual_len = len(actual)
-		expected_len = len(expected)
+		return self._compare_details_lines(actual, len(actual), expected, len(expected), compare_fn, type_error_message, assertion_message_fn)
 
+	# Numbers of lines are compared before contents, so they are passed separately from (possibly lazy) lines.
+	def _compare_details_lines(self, actual: Iterable[str], actual_len: int, expected: Iterable[str], expected_len: int, compare_fn: Callable[[str, str], bool], type_error_message: str, assertion_message_fn: Callable[[int, int, str, str], BaseResult] = None) -> BaseResult:
 		# CASE: fatal assertion.
 		if actual_len != expected_len:
 			return err_assertion_len(actual_len, expected_len)
 
 		# CASE: assertion.
-		for i in range(min(actual_len, expected_len)):
-			actual_contents = actual[i].strip().split(' ')
-			expected_contents = expected[i].strip().split(' ')
+		for i, (actual_line, expected_line) in enumerate(zip(actual, expected)):
+			actual_contents = actual_line.strip().split(' ')
+			expected_contents = expected_line.strip().split(' ')
 
 			actual_contents_len = len(actual_contents)
 			expected_contents_len = len(expected_contents)
@@ -350,137 +1226,95 @@ class BaseTest:
 
 		self.__passes = exitcode == 0
 
-	# Returns None, if there was a timeout expired exception.
-	# Otherwise, returns tuple of STDOUT, STDERR and RETURNCODE of program.
-	def __runner(self, program: str, input: Union[str, int, float, List[str], List[int], List[float]], timeout: float, timeout_factor: float) -> Tuple[int, Optional[Tuple[str, str, int]]]:
-		full_program = [program]
-		full_timeout = timeout * timeout_factor
-
-		# If it's not STDIN communication, turn input to list as cmd's arguments.
-		if not self.__is_stdin_input:
-			full_program += to_list(input, False)
-
-		# If it's STDIN communication, then process should be created and then communicated.
-		# Otherwise, run once.
-		if self.__is_stdin_input:
-			proc = subprocess.Popen(full_program, stdin = subprocess.PIPE, stdout = subprocess.PIPE, stderr = subprocess.PIPE, universal_newlines = True)
-			start = get_time()
-			try:
-				if self.__is_raw_input:
-					stdout, stderr = proc.communicate(to_str(input, self.__input_separator), timeout = full_timeout)
-					end = get_time()
-					return (end - start, (stdout, stderr, proc.returncode))
-				else:
-					file_content = ""
-					if isinstance(input, str):
-						with open(input, 'r') as stream:
-							file_content = stream.read()
-					else:
-						raise ValueError('[FATAL ERROR] When it\'s stdin communication and not as raw string producer, then it should be path/to/file with wanted contents.')
-					stdout, stderr = proc.communicate(file_content, timeout = full_timeout)
-					end = get_time()
-					return (end - start, (stdout, stderr, proc.returncode))
-			except subprocess.TimeoutExpired:
-				end = get_time()
-				proc.kill()
-				return (end - start, None)
-		else:
-			start = get_time()
-			try:
-				proc = subprocess.Popen(full_program, stdin = subprocess.PIPE, stdout = subprocess.PIPE, stderr = subprocess.PIPE, universal_newlines = True)
-				stdout, stderr = proc.communicate(timeout = full_timeout)
-				end = get_time()
-				return (end - start, (stdout, stderr, proc.returncode))
-			except subprocess.TimeoutExpired:
-				end = get_time()
-				proc.kill()
-				return (end - start, None)
-
-	def __collect_to_result(self, stdout: str, stderr: str, returncode: int, timer: int, base_result: BaseResult) -> BaseResult:
+	def __runner(self, program: str, timeout_factor: float, session: Optional[BaseBatchSession], sandbox: Optional[BaseSandbox]) -> BaseExecution:
+		args, input, timeout = self.prepare(program, timeout_factor)
+		if session is not None and not self.__is_stdin_input:
+			execution = session.execute(args[1:], timeout)
+			if execution is not None:
+				return execution
+		if sandbox is None:
+			return execute(args, input, timeout)
+		return sandbox.execute(args, input, timeout, self.__output_stream)
+
+	def __collect_to_result(self, returncode: int, execution: BaseExecution, artifacts: BaseArtifacts, base_result: BaseResult) -> BaseResult:
 		base_result.testing_type = self.__testing_type
-		base_result.output = stdout
+		base_result.output = execution.report_text('stdout')
 
 		if self.__output_stream is not None:
 			if not os.path.exists(self.__output_stream):
 				base_result.output = None
 			else:
 				if self.__testing_type == BaseTestingType.T_TEXT:
-					with open(self.__output_stream, 'r') as file:
-						base_result.output = file.read()
+					base_result.output = artifacts.get_output()
 				elif self.__testing_type == BaseTestingType.T_BINARY:
+					# Only presence of binary output is reported, so the whole file is not kept.
 					with open(self.__output_stream, 'rb') as file:
-						base_result.output = file.read()
+						base_result.output = file.read(BaseComparator.BINARY_CONTEXT)
 
-		base_result.stderr = stderr
-		base_result.timer = timer
+		base_result.stderr = execution.report_text('stderr')
 		base_result.exitcode = returncode
+		execution.account(base_result)
 
 		return base_result
 
-	def __should_pass(self, stdout: str, stderr: str, returncode: int, check_output: bool) -> BaseResult:
+	def __should_pass(self, execution: BaseExecution, stderr: str, returncode: int, check_output: bool, artifacts: BaseArtifacts, log: List[str]) -> BaseResult:
 		# CASE: Program doesn't returns 0.
 		empty_stderr = stderr == "" or stderr is None
 		if returncode != 0:
-			# For sanitizers.
-			if not empty_stderr:
-				print('       STDERR -->')
-				print(stderr)
-				print('   <-- STDERR')
+			dump_stderr(log, stderr)
 			return err_should_pass(returncode)
 
 		# If there is no point to check output, then skip and return OK.
 		if not check_output:
-			# For sanitizers.
-			if not empty_stderr:
-				print('       STDERR -->')
-				print(stderr)
-				print('   <-- STDERR')
+			dump_stderr(log, stderr)
 			return err_ok()
 
 		# CASE: Error output should be empty.
 		if not empty_stderr:
 			return err_stderr_not_empty(stderr)
 
-		# Read actual content.
-		actual_content: ContentT = None
+		# CASE: assertion (text is compared line by line, small files are read once and kept for the report).
 		if self.__testing_type == BaseTestingType.T_TEXT:
+			actual_lines: Optional[BaseLines] = None
 			if self.__output_stream is None:
-				actual_content = stdout.split('\n')
+				actual_lines = execution.lines('stdout')
 			else:
-				if not os.path.exists(self.__output_stream):
+				actual_lines = artifacts.get_output_lines()
+				if actual_lines is None:
 					return err_file_not_found(self.__output_stream)
-				with open(self.__output_stream, 'r') as file:
-					actual_content = file.read().split('\n')
-		elif self.__testing_type == BaseTestingType.T_BINARY and self.__output_stream is not None:
+
+			expected_lines: Optional[BaseLines] = None
+			if self.__is_raw_output:
+				expected_lines = BaseLines(to_list(self.__expected))
+			else:
+				expected_lines = artifacts.get_reference_lines()
+				if expected_lines is None:
+					raise FileNotFoundError("[FATAL ERROR] Reference file \"%s\" not found." % (self.__expected))
+			return self.__comparator.compare_lines(actual_lines, expected_lines)
+
+		# Read actual content.
+		actual_content: ContentT = None
+		if self.__testing_type == BaseTestingType.T_BINARY and self.__output_stream is not None:
 			if not os.path.exists(self.__output_stream):
 				return err_file_not_found(self.__output_stream)
-			with open(self.__output_stream, 'rb') as file:
-				actual_content = file.read()
-		elif self.__testing_type == BaseTestingType.T_META and self.__output_stream is None:
+			if not isinstance(self.__expected, str):
+				raise ValueError('[FATAL ERROR] When it\'s not raw string producer, then it should be path/to/file with wanted contents.')
+			# CASE: assertion (files are compared without reading them at once).
+			return self.__comparator.compare_binary_files(self.__output_stream, self.__expected)
+		elif self.__testing_type == BaseTestingType.T_META:
 			actual_content = BaseMeta(self.__input)
 		else:
 			raise ValueError("[FATAL ERROR] Testing type is not exists or incompatible combination with output stream")
 
 		# Read expected content.
 		expected_content: ContentT = None
-		if self.__is_raw_output and self.__testing_type == BaseTestingType.T_TEXT:
-			expected_content = to_list(self.__expected)
-		elif self.__testing_type == BaseTestingType.T_BINARY or self.__testing_type == BaseTestingType.T_TEXT:
-			if not isinstance(self.__expected, str):
-				raise ValueError('[FATAL ERROR] When it\'s not raw string producer, then it should be path/to/file with wanted contents.')
-			if self.__testing_type == BaseTestingType.T_TEXT:
-				with open(self.__expected, 'r') as file:
-					expected_content = file.read().split('\n')
-			else:
-				with open(self.__expected, 'rb') as file:
-					expected_content = file.read()
-		elif self.__testing_type == BaseTestingType.T_META:
+		if self.__testing_type == BaseTestingType.T_META:
 			expected_content = BaseMeta(self.__expected)
 
 		# CASE: assertion.
 		return self.__comparator.compare(actual_content, expected_content)
 
-	def __should_fail(self, stdout: str, stderr: str, returncode: int) -> BaseResult:
+	def __should_fail(self, stdout: str, stderr: str, returncode: int, log: List[str]) -> BaseResult:
 		# CASE: Program returns 0.
 		if returncode == 0:
 			return err_should_fail()
@@ -498,39 +1332,122 @@ class BaseTest:
 
 		# CASE: Exitcode must be correct.
 		if returncode != self.__exitcode:
-			# For sanitizers.
-			if not empty_stderr:
-				print('       STDERR -->')
-				print(stderr)
-				print('   <-- STDERR')
+			dump_stderr(log, stderr)
 			return err_exitcode(returncode, self.__exitcode)
 
 		return err_ok()
 
-	def run(self, program: str, check_output: bool, timeout_factor: float) -> BaseResult:
-		try:
-			timer, results = self.__runner(program, self.__input, self.__timeout, timeout_factor)
+	# Command line, stdin content and timeout of the test's run.
+	def prepare(self, program: str, timeout_factor: float) -> Tuple[List[str], Optional[str], float]:
+		full_program = [program]
+		full_timeout = self.__timeout * timeout_factor
+
+		# If it's not STDIN communication, turn input to list as cmd's arguments.
+		if not self.__is_stdin_input:
+			return full_program + to_list(self.__input, False), None, full_timeout
 
-			# If it's None, then there was a Timeout error.
-			if results is None:
-				timeout_result = err_timeout()
-				timeout_result.timer = timer
-				timeout_result.exitcode = -1
-				timeout_result.testing_type = self.__testing_type
-				return timeout_result
+		if self.__is_raw_input:
+			return full_program, to_str(self.__input, self.__input_separator), full_timeout
 
-			stdout, stderr, returncode = results
+		file_content = ""
+		if isinstance(self.__input, str):
+			with open(self.__input, 'r') as stream:
+				file_content = stream.read()
+		else:
+			raise ValueError('[FATAL ERROR] When it\'s stdin communication and not as raw string producer, then it should be path/to/file with wanted contents.')
+		return full_program, file_content, full_timeout
 
-			if self.__passes:
-				should_pass_result = self.__should_pass(stdout, stderr, returncode, check_output)
-				return self.__collect_to_result(stdout, stderr, returncode, timer, should_pass_result)
+	# Verdict of the test by its finished run.
+	def evaluate(self, execution: BaseExecution, check_output: bool) -> BaseResult:
+		artifacts = BaseArtifacts(self)
+		try:
+			result = self.__judge(execution, check_output, artifacts)
+		except Exception as e:
+			result = self.__unknown(e)
+		finally:
+			execution.close()
+		result.artifacts = artifacts
+		return result
+
+	def __judge(self, execution: BaseExecution, check_output: bool, artifacts: BaseArtifacts) -> BaseResult:
+		if execution.timed_out:
+			timeout_result = err_timeout()
+			execution.account(timeout_result)
+			timeout_result.exitcode = -1
+			timeout_result.testing_type = self.__testing_type
+			# Output written before the program was killed (only its beginning, if it is longer than the capture limit).
+			if self.__testing_type == BaseTestingType.T_TEXT:
+				timeout_result.output = execution.report_text('stdout')
+			timeout_result.stderr = execution.report_text('stderr')
+			return timeout_result
+
+		if execution.limit_result is not None:
+			limit_result = execution.limit_result
+			execution.account(limit_result)
+			limit_result.exitcode = execution.returncode
+			limit_result.stderr = execution.report_text('stderr')
+			limit_result.testing_type = self.__testing_type
+			return limit_result
+
+		stdout, stderr, returncode = execution.stdout, execution.stderr, execution.returncode
+		log: List[str] = []
+
+		if self.__passes:
+			should_pass_result = self.__should_pass(execution, stderr, returncode, check_output, artifacts, log)
+			should_pass_result.log = log
+			return self.__collect_to_result(returncode, execution, artifacts, should_pass_result)
+
+		should_fail_result = self.__should_fail(stdout, stderr, returncode, log)
+		should_fail_result.log = log
+		return self.__collect_to_result(returncode, execution, artifacts, should_fail_result)
+
+	def run(self, program: str, check_output: bool, timeout_factor: float, session: Optional[BaseBatchSession] = None, sandbox: Optional[BaseSandbox] = None) -> BaseResult:
+		try:
+			execution = self.__runner(program, timeout_factor, session, sandbox)
+		except Exception as e:
+			return self.__unknown(e)
+		return self.evaluate(execution, check_output)
 
-			should_fail_result = self.__should_fail(stdout, stderr, returncode)
-			return self.__collect_to_result(stdout, stderr, returncode, timer, should_fail_result)
+	async def run_async(self, program: str, check_output: bool, timeout_factor: float, sandbox: Optional[BaseSandbox] = None) -> BaseResult:
+		try:
+			args, input, timeout = self.prepare(program, timeout_factor)
+			if sandbox is None:
+				execution = await execute_async(args, input, timeout)
+			else:
+				execution = await sandbox.execute_async(args, input, timeout, self.__output_stream)
 		except Exception as e:
-			result = err_unknown(str(e))
-			result.testing_type = self.__testing_type
-			return result
+			return self.__unknown(e)
+		return self.evaluate(execution, check_output)
+
+	def __unknown(self, e: Exception) -> BaseResult:
+		result = err_unknown(str(e))
+		result.testing_type = self.__testing_type
+		return result
+
+	def get_output_stream(self) -> Optional[str]:
+		return self.__output_stream
+
+	def get_raw_input(self) -> Union[str, int, float, List[str], List[int], List[float]]:
+		return self.__input
+
+	# Test of the same kind with another input and expectations (used by minimization).
+	def derive(self, name: str, input: Union[str, int, float, List[str], List[int], List[float]], expected: Optional[Union[str, int, float, List[str], List[int], List[float]]], output_stream: Optional[str] = None, exitcode: int = 0, comparator: Optional[BaseComparator] = None) -> 'BaseTest':
+		return BaseTest(name, self.categories, input, expected, output_stream, self.__timeout, exitcode, self.__is_stdin_input, self.__is_raw_input, self.__is_raw_output, self.__input_separator, comparator if comparator is not None else self.__comparator, self.__testing_type)
+
+	def get_testing_type(self) -> BaseTestingType:
+		return self.__testing_type
+
+	def skip(self, reason: str) -> BaseResult:
+		result = err_skipped(reason)
+		result.testing_type = self.__testing_type
+		return result
+
+	# Rough estimation of how expensive the test is: size of input files (or length of raw input).
+	def get_cost(self) -> int:
+		cost = 0
+		for item in to_list(self.__input, False):
+			cost += os.path.getsize(item) if os.path.isfile(item) else len(item)
+		return cost
 
 	def get_input(self) -> str:
 		input_content = to_str(self.__input, ' ')
@@ -539,6 +1456,14 @@ class BaseTest:
 				input_content = stream.read()
 		return input_content
 
+	# Path to the file with wanted contents (None, if reference is given as raw string).
+	def get_reference_file(self) -> Optional[str]:
+		if self.__expected is None or self.__is_raw_output:
+			return None
+		if not isinstance(self.__expected, str):
+			raise ValueError('[FATAL ERROR] When it\'s not raw string producer, then it should be path/to/file with wanted contents.')
+		return self.__expected
+
 	def get_reference(self) -> str:
 		if self.__expected is None:
 			return None
@@ -551,80 +1476,245 @@ class BaseTest:
 class BaseSuite:
 	def __init__(self):
 		self.__results: List[Tuple[BaseTest, BaseResult]] = []
+		# Numbers of passed and all tests, updated on every added result.
+		self.__passed = 0
+		self.__categories: Dict[str, List[int]] = {}
+		self.__groups: Dict[str, List[int]] = {}
 
 	def add_result(self, test: BaseTest, result: BaseResult):
 		self.__results.append((test, result))
+		passed = 1 if result.ok() else 0
+		self.__passed += passed
+		for category in set(test.categories):
+			self.__count(self.__categories, category, passed)
+		# Test is counted once in its group, even if it is in several categories of the group.
+		for group in set(get_category_group(category) for category in test.categories):
+			self.__count(self.__groups, group, passed)
+
+	def __count(self, counters: Dict[str, List[int]], key: str, passed: int):
+		counter = counters.setdefault(key, [0, 0])
+		counter[0] += passed
+		counter[1] += 1
 
 	def ok(self) -> bool:
-		return all(result.ok() for _, result in self.__results)
+		return self.__passed == len(self.__results)
 
-	def __get_number_passed(self, category: str) -> int:
-		passed = 0
-		for results in self.__results:
-			test, result = results
-			if result.ok() and category in test.categories:
-				passed += 1
-		return passed
-
-	def __get_number_total(self, category: str) -> int:
-		total = 0
-		for results in self.__results:
-			test, _ = results
-			if category in test.categories:
-				total += 1
-		return total
+	def get_results(self) -> List[Tuple[BaseTest, BaseResult]]:
+		return self.__results
 
 	def get_all_categories(self) -> Set[str]:
-		all_categories: Set[str] = set()
-		for results in self.__results:
-			test, _ = results
-			all_categories.update(test.categories)
-		return all_categories
+		return set(self.__categories)
 
 	def get_raw_results(self) -> Dict[str, float]:
-		raw: Dict[str, float] = {}
-		categories = self.get_all_categories()
+		return {category: passed / total for category, (passed, total) in self.__categories.items()}
 
-		for category in categories:
-			passed = self.__get_number_passed(category)
-			total = self.__get_number_total(category)
-			raw[category] = (passed / total)
+	# Same as raw results, but for groups of categories (see `get_category_group`).
+	def get_grouped_results(self) -> Dict[str, float]:
+		return {group: passed / total for group, (passed, total) in self.__groups.items()}
 
-		return raw
+	# Timing statistics (in milliseconds) per test and per category over benchmarked results.
+	def get_bench_results(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+		tests: Dict[str, Dict[str, float]] = {}
+		categories: Dict[str, List[int]] = {}
+		for i, results in enumerate(self.__results):
+			test, result = results
+			if len(result.samples) == 0:
+				continue
+			tests["test_%d" % (i)] = timing_statistics(result.samples)
+			for category in test.categories:
+				categories.setdefault(category, []).extend(result.samples)
+		return { 'tests': tests, 'categories': { category: timing_statistics(samples) for category, samples in categories.items() } }
 
 	def json(self) -> Dict[str, dict]:
 		json_results: Dict[str, dict] = {}
 		for i, results in enumerate(self.__results):
 			test, result = results
-			json_object_name = "test_%d" % (i)
-			json_single_result = {}
-			json_single_result['categories'] = list(test.categories)
-			json_single_result['passed'] = result.ok()
-			json_single_result['verdict'] = result.get_verdict()
-			additional_info = result.get_additional_info()
-			if additional_info is not None:
-				json_single_result['verdict_additional_info'] = additional_info
-			json_single_result['name'] = test.name
-			json_single_result['input'] = test.get_input()
-			if result.testing_type == BaseTestingType.T_TEXT:
-				json_single_result['output'] = '<no output>' if result.output is None or result.output == '' else result.output
-			elif result.testing_type == BaseTestingType.T_BINARY:
-				json_single_result['output'] = '<no output>' if result.output is None or result.output == '' else '<raw bytes>'
-			elif result.testing_type == BaseTestingType.T_META:
-				json_single_result['output'] = '<very meta info>'
-			if result.testing_type == BaseTestingType.T_TEXT:
-				reference_str = test.get_reference()
-				json_single_result['reference'] = '<no reference>' if reference_str is None or reference_str == '' else reference_str
-			else:
-				json_single_result['reference'] = '<no reference>'
-			json_single_result['stderr'] = '<no error output>' if result.stderr is None or result.stderr == '' else result.stderr
-			json_single_result['exitcode'] = result.exitcode
-			json_single_result['time'] = result.timer
-			json_results[json_object_name] = json_single_result
+			json_results["test_%d" % (i)] = self.json_result(test, result)
 		return json_results
 
+	@staticmethod
+	def json_result(test: BaseTest, result: BaseResult) -> dict:
+		# Files already read by the run are not read again.
+		artifacts = result.artifacts if result.artifacts is not None else BaseArtifacts(test)
+		json_single_result = {}
+		json_single_result['categories'] = list(test.categories)
+		json_single_result['passed'] = result.ok()
+		json_single_result['verdict'] = result.get_verdict()
+		additional_info = result.get_additional_info()
+		if additional_info is not None:
+			json_single_result['verdict_additional_info'] = additional_info
+		json_single_result['name'] = test.name
+		json_single_result['input'] = artifacts.get_input()
+		if result.testing_type == BaseTestingType.T_TEXT:
+			json_single_result['output'] = '<no output>' if result.output is None or result.output == '' else result.output
+		elif result.testing_type == BaseTestingType.T_BINARY:
+			json_single_result['output'] = '<no output>' if not result.output else '<raw bytes>'
+		elif result.testing_type == BaseTestingType.T_META:
+			json_single_result['output'] = '<very meta info>'
+		json_single_result['reference'] = BaseSuite.json_reference(artifacts, result.testing_type)
+		json_single_result['stderr'] = '<no error output>' if result.stderr is None or result.stderr == '' else result.stderr
+		json_single_result['exitcode'] = result.exitcode
+		json_single_result['time'] = result.timer
+		json_single_result['wall_time_ns'] = result.wall_time_ns
+		json_single_result['cpu_user_time'] = result.cpu_user_time
+		json_single_result['cpu_system_time'] = result.cpu_system_time
+		json_single_result['peak_rss'] = result.peak_rss
+		return json_single_result
+
+	@staticmethod
+	def json_reference(artifacts: BaseArtifacts, testing_type: BaseTestingType) -> str:
+		if testing_type == BaseTestingType.T_TEXT:
+			reference_str = artifacts.get_reference()
+			return '<no reference>' if reference_str is None or reference_str == '' else reference_str
+		return '<no reference>'
+
+# Writes JSON report incrementally: every result is flushed as soon as it is known, so an interrupted run loses nothing.
+class BaseReportWriter:
+	# Fields of test entry, which may be large.
+	SPILLED_FIELDS = ['input', 'output', 'reference', 'stderr']
+
+	def __init__(self, path: str, field_limit: int = 0):
+		self.path = path
+		# Longer fields are truncated in report, their full values are written into side files (0 - no limit).
+		self.field_limit = field_limit
+		self.__files_dir = path + '.files'
+		if os.path.isdir(self.__files_dir):
+			shutil.rmtree(self.__files_dir)
+		self.__file = open(path, 'w')
+		self.__file.write('{')
+		self.__empty = True
+
+	def write(self, key: str, value):
+		# Entry is indented as if the whole report was dumped at once.
+		entry = json.dumps({key: value}, indent = 4)[1:-2]
+		self.__file.write(entry if self.__empty else ',' + entry)
+		self.__file.flush()
+		self.__empty = False
+
+	def write_result(self, i: int, test: BaseTest, result: BaseResult):
+		key = "test_%d" % (i)
+		self.write(key, self.json_result(key, test, result))
+
+	# Entry of test with spilled fields, `key` should be unique in the report (it names side files).
+	def json_result(self, key: str, test: BaseTest, result: BaseResult) -> dict:
+		json_result = BaseSuite.json_result(test, result)
+		if self.field_limit > 0:
+			for field in self.SPILLED_FIELDS:
+				value = json_result.get(field)
+				if not isinstance(value, str) or len(value) <= self.field_limit:
+					continue
+				ensure_existence_directory(self.__files_dir)
+				side_file = os.path.join(self.__files_dir, "%s.%s" % (key, field))
+				with open(side_file, 'w', newline = '') as file:
+					file.write(value)
+				json_result[field] = value[:self.field_limit]
+				json_result[field + '_file'] = os.path.relpath(side_file, os.path.dirname(os.path.abspath(self.path)))
+		return json_result
+
+	def close(self):
+		self.__file.write('\n}')
+		self.__file.close()
+
+	# Reads report back with full values of spilled fields. Report of interrupted run is read up to its last complete entry.
+	@staticmethod
+	def load(path: str) -> Dict[str, dict]:
+		with open(path, 'r') as file:
+			text = file.read()
+		try:
+			report = json.loads(text)
+		except json.JSONDecodeError:
+			end = text.rfind('\n    }')
+			report = json.loads(text[:end] + '\n    }\n}') if end != -1 else {}
+
+		report_dir = os.path.dirname(os.path.abspath(path))
+		for key, value in report.items():
+			if not key.startswith('test_') or not isinstance(value, dict):
+				continue
+			for field in BaseReportWriter.SPILLED_FIELDS:
+				side_file = value.get(field + '_file')
+				if side_file is None:
+					continue
+				with open(os.path.join(report_dir, side_file), 'r', newline = '') as file:
+					value[field] = file.read()
+		return report
+
+class BaseRunOptions:
+	# Tests are run by a pool of `jobs` threads or as `jobs` coroutines of one event loop.
+	BACKENDS = ['threads', 'asyncio']
+
+	def __init__(self, jobs: int = 1, repeat: int = 1, warmup: int = 0, bench: bool = False, fail_fast: bool = False, abort_after: int = 0, smoke_first: bool = False, batch: bool = False, sandbox: Optional[BaseSandbox] = None, backend: str = 'threads', reuse: Optional[Dict[int, BaseResult]] = None, on_result: Optional[Callable[[int, BaseTest, BaseResult], None]] = None, release: bool = False):
+		# Number of tests running at the same time.
+		self.jobs = jobs
+		if backend not in self.BACKENDS:
+			raise ValueError("[FATAL ERROR] Unknown backend \"%s\"." % (backend))
+		self.backend = backend
+
+		# Skip all remaining tests after the first failed one.
+		self.fail_fast = fail_fast
+		# Skip remaining tests of a category after this number of consecutive timeouts in it (0 - never).
+		self.abort_after = abort_after
+		# Run the cheapest test of each category before all others.
+		self.smoke_first = smoke_first
+
+		# Pass tests to one long-lived process per worker (see `BaseBatchSession`), where suite supports it.
+		self.batch = batch
+		# Limits and isolation of every run (batch mode is not used then).
+		self.sandbox = sandbox
+
+		# Results (by test index) taken as they are instead of running tests.
+		self.reuse: Dict[int, BaseResult] = reuse if reuse is not None else {}
+		# Called for every result (including reused ones) as soon as it is reported.
+		self.on_result = on_result
+		# Drop outputs and contents of test's files of every result after it is reported (nothing reads them later).
+		self.release = release
+
+		# Benchmark mode: each test is run `warmup` times unmeasured, then `repeat` times measured.
+		self.bench = bench
+		self.repeat = repeat if bench else 1
+		self.warmup = warmup if bench else 0
+
+# Decides which tests should be skipped according to already known results. Shared by all workers.
+class BaseAbortPolicy:
+	def __init__(self, options: BaseRunOptions):
+		self.__fail_fast = options.fail_fast
+		self.__abort_after = options.abort_after
+		self.__lock = threading.Lock()
+		self.__failed = False
+		self.__consecutive_timeouts: Dict[str, int] = {}
+		self.__aborted: Set[str] = set()
+
+	# Returns None, if test should be run.
+	def skip_reason(self, test: BaseTest) -> Optional[str]:
+		with self.__lock:
+			if self.__fail_fast and self.__failed:
+				return 'fail fast: one of previous tests failed'
+			for category in test.categories:
+				if category in self.__aborted:
+					return "category '%s' aborted after %d consecutive timeouts" % (category, self.__abort_after)
+			return None
+
+	def update(self, test: BaseTest, result: BaseResult):
+		with self.__lock:
+			if result.get_errno() == Errno.ERROR_SKIPPED:
+				return
+			if not result.ok():
+				self.__failed = True
+			for category in test.categories:
+				if result.get_errno() != Errno.ERROR_TIMEOUT:
+					self.__consecutive_timeouts[category] = 0
+					continue
+				self.__consecutive_timeouts[category] = self.__consecutive_timeouts.get(category, 0) + 1
+				if self.__abort_after > 0 and self.__consecutive_timeouts[category] >= self.__abort_after:
+					self.__aborted.add(category)
+
+# Returns smaller variants of a test (the most reduced first), nothing - if test can't be reduced. Variants are taken lazily.
+ShrinkerT = Callable[[BaseTest], Iterable[BaseTest]]
+
 class BaseTester:
-	def __init__(self, is_stdin_input: bool = True, is_raw_input: bool = True, is_raw_output: bool = True, input_separator: str = ' ', testing_type: BaseTestingType = BaseTestingType.T_TEXT):
+	# Minimization of a single test stops after this number of runs.
+	MINIMIZE_MAX_RUNS = 100
+
+	def __init__(self, is_stdin_input: bool = True, is_raw_input: bool = True, is_raw_output: bool = True, input_separator: str = ' ', testing_type: BaseTestingType = BaseTestingType.T_TEXT, supports_batch: bool = False, shrinker: Optional[ShrinkerT] = None):
 		self.__is_stdin_input = is_stdin_input
 		self.__is_raw_input = is_raw_input
 		self.__is_raw_output = is_raw_output
@@ -632,6 +1722,10 @@ class BaseTester:
 		self.__testing_type = testing_type
 		self.__tests: List[BaseTest] = []
 
+		# Batch mode makes sense only for tests, which pass everything through cmd's arguments and stdout.
+		self.__supports_batch = supports_batch and not is_stdin_input
+		self.__shrinker = shrinker
+
 		# Not RAW input with not STDIN communication sounds strange.
 		if not self.__is_stdin_input and not self.__is_raw_input:
 			raise NotImplementedError('[FATAL ERROR] Not raw input (from file) with cmd\'s arguments communication is not supported yet.')
@@ -644,16 +1738,269 @@ class BaseTester:
 		test = BaseTest(name, categories, input, None, None, timeout, exitcode, self.__is_stdin_input, self.__is_raw_input, self.__is_raw_output, self.__input_separator, None, self.__testing_type)
 		self.__tests.append(test)
 
-	def run(self, program: str, check_output: bool, timeout_factor: float) -> BaseSuite:
+	def get_tests(self) -> List[BaseTest]:
+		return self.__tests
+
+	# Results of tests, which passed in a previous report and were not changed since then (same name, input and reference).
+	def get_reusable_results(self, report: Dict[str, dict]) -> Dict[int, BaseResult]:
+		reusable: Dict[int, BaseResult] = {}
+		for i, test in enumerate(self.__tests):
+			previous = report.get("test_%d" % (i))
+			if previous is None or not previous.get('passed', False):
+				continue
+			artifacts = BaseArtifacts(test)
+			if previous.get('name') != test.name or previous.get('input') != artifacts.get_input() or previous.get('reference') != BaseSuite.json_reference(artifacts, test.get_testing_type()):
+				continue
+			reusable[i] = BaseResult.from_json(previous, test.get_testing_type())
+		return reusable
+
+	def run(self, program: str, check_output: bool, timeout_factor: float, options: Optional[BaseRunOptions] = None) -> BaseSuite:
+		return self.run_many([program], check_output, timeout_factor, options)[0]
+
+	# Tests of all programs are run by common workers on the same fixtures. Results are reported program by program,
+	# `reuse` and `on_result` (by test index) are supported for a single program only.
+	def run_many(self, programs: List[str], check_output: bool, timeout_factor: float, options: Optional[BaseRunOptions] = None) -> List[BaseSuite]:
 		# If there is no file, then no test.
-		if not os.path.exists(program):
-			raise FileNotFoundError("[FATAL ERROR] File (executable) named \"%s\" not found." % (program))
+		for program in programs:
+			if not os.path.exists(program):
+				raise FileNotFoundError("[FATAL ERROR] File (executable) named \"%s\" not found." % (program))
+
+		if options is None:
+			options = BaseRunOptions()
+		if len(programs) > 1 and (len(options.reuse) != 0 or options.on_result is not None):
+			raise ValueError('[FATAL ERROR] Reused results and per-result callback are supported for a single program only.')
+
+		order = [i for i in self.__schedule(options) if i not in options.reuse]
+		units = [(p, i) for p in range(len(programs)) for i in order]
+		# Each program is skipped by its own results.
+		policies = [BaseAbortPolicy(options) for _ in programs]
+		results: List[List[Optional[BaseResult]]] = [[options.reuse.get(i) for i in range(len(self.__tests))] for _ in programs]
+		if options.on_result is not None:
+			for i in sorted(options.reuse):
+				options.on_result(i, self.__tests[i], results[0][i])
+				if options.release:
+					results[0][i].release()
+
+		if options.batch and not self.__supports_batch:
+			print("-- Batch mode is not supported by this suite, each test runs in its own process")
+		elif options.batch and options.sandbox is not None and options.sandbox.is_restricted():
+			print("-- Batch mode is not used in sandbox, each test runs in its own process")
+		elif options.batch and options.backend == 'asyncio':
+			print("-- Batch mode is not used with asyncio backend, each test runs in its own process")
+
+		if options.backend == 'asyncio':
+			asyncio.run(self.__run_scheduled_async(units, results, policies, programs, check_output, timeout_factor, options))
+			return [self.__make_suite(program_results) for program_results in results]
+
+		# Each worker has its own batch session for each program.
+		sessions: List[BaseBatchSession] = []
+		local = threading.local()
+
+		def session(p: int) -> Optional[BaseBatchSession]:
+			if not options.batch or not self.__supports_batch or (options.sandbox is not None and options.sandbox.is_restricted()):
+				return None
+			if not hasattr(local, 'sessions'):
+				local.sessions = {}
+			if p not in local.sessions:
+				local.sessions[p] = BaseBatchSession(programs[p])
+				sessions.append(local.sessions[p])
+			return local.sessions[p]
 
+		try:
+			self.__run_scheduled(units, results, policies, session, programs, check_output, timeout_factor, options)
+		finally:
+			for batch_session in sessions:
+				batch_session.close()
+
+		return [self.__make_suite(program_results) for program_results in results]
+
+	def __run_scheduled(self, units: List[Tuple[int, int]], results: List[List[Optional[BaseResult]]], policies: List[BaseAbortPolicy], session: Callable[[int], Optional[BaseBatchSession]], programs: List[str], check_output: bool, timeout_factor: float, options: BaseRunOptions):
+		if options.jobs <= 1:
+			for p, i in units:
+				test = self.__tests[i]
+				skip_reason = policies[p].skip_reason(test)
+				if skip_reason is None:
+					print("-- Performing %s..." % (self.__label(programs, p, test)))
+					results[p][i] = self.__run_test(test, programs[p], check_output, timeout_factor, options, session(p))
+				else:
+					print("-- Skipping %s..." % (self.__label(programs, p, test)))
+					results[p][i] = test.skip(skip_reason)
+				policies[p].update(test, results[p][i])
+				self.__report_result(i, results[p][i], options)
+			return
+
+		futures: Dict[Tuple[int, int], Future] = { unit: Future() for unit in units }
+
+		def run_lane(lane: List[Tuple[int, int]]):
+			for p, i in lane:
+				try:
+					test = self.__tests[i]
+					skip_reason = policies[p].skip_reason(test)
+					result = self.__run_test(test, programs[p], check_output, timeout_factor, options, session(p)) if skip_reason is None else test.skip(skip_reason)
+					policies[p].update(test, result)
+					futures[(p, i)].set_result(result)
+				except BaseException as e:
+					futures[(p, i)].set_exception(e)
+
+		with ThreadPoolExecutor(max_workers = options.jobs) as pool:
+			for lane in self.__make_lanes(units).values():
+				pool.submit(run_lane, lane)
+
+			# Verdicts are printed in the scheduled order, whatever order tests finish in.
+			for p, i in units:
+				results[p][i] = futures[(p, i)].result()
+				self.__print_result(programs, p, i, results[p][i], options)
+
+	# Same scheduling as with threads, but lanes are coroutines, and `jobs` only limits number of running processes.
+	async def __run_scheduled_async(self, units: List[Tuple[int, int]], results: List[List[Optional[BaseResult]]], policies: List[BaseAbortPolicy], programs: List[str], check_output: bool, timeout_factor: float, options: BaseRunOptions):
+		semaphore = asyncio.Semaphore(max(1, options.jobs))
+		loop = asyncio.get_running_loop()
+		futures: Dict[Tuple[int, int], asyncio.Future] = { unit: loop.create_future() for unit in units }
+
+		async def run_lane(lane: List[Tuple[int, int]]):
+			for p, i in lane:
+				try:
+					test = self.__tests[i]
+					# Skipping is decided by results known at the moment, when the test can start.
+					async with semaphore:
+						skip_reason = policies[p].skip_reason(test)
+						result = await self.__run_test_async(test, programs[p], check_output, timeout_factor, options) if skip_reason is None else test.skip(skip_reason)
+						policies[p].update(test, result)
+					futures[(p, i)].set_result(result)
+				except Exception as e:
+					futures[(p, i)].set_exception(e)
+
+		lanes = [asyncio.ensure_future(run_lane(lane)) for lane in self.__make_lanes(units).values()]
+
+		# Verdicts are printed in the scheduled order, whatever order tests finish in.
+		for p, i in units:
+			results[p][i] = await futures[(p, i)]
+			self.__print_result(programs, p, i, results[p][i], options)
+		await asyncio.gather(*lanes)
+
+	# Name of the test in console output, with the program, if there are several ones.
+	def __label(self, programs: List[str], p: int, test: BaseTest) -> str:
+		return test.name if len(programs) == 1 else "%s (%s)" % (test.name, programs[p])
+
+	def __print_result(self, programs: List[str], p: int, i: int, result: BaseResult, options: BaseRunOptions):
+		if result.get_errno() == Errno.ERROR_SKIPPED:
+			print("-- Skipping %s..." % (self.__label(programs, p, self.__tests[i])))
+		else:
+			print("-- Performing %s..." % (self.__label(programs, p, self.__tests[i])))
+		self.__report_result(i, result, options)
+
+	# Runs writing into the same output file (of any programs) are chained into one lane, so they never run at the same time.
+	def __make_lanes(self, units: List[Tuple[int, int]]) -> Dict[Union[str, Tuple[int, int]], List[Tuple[int, int]]]:
+		lanes: Dict[Union[str, Tuple[int, int]], List[Tuple[int, int]]] = {}
+		for p, i in units:
+			output_stream = self.__tests[i].get_output_stream()
+			lanes.setdefault((p, i) if output_stream is None else os.path.abspath(output_stream), []).append((p, i))
+		return lanes
+
+	# Each failed test is replaced by the first of its smaller variants, which fails with the same verdict, while there is such one.
+	# Returns the smallest variants (with their results) by index of the original test.
+	def minimize(self, program: str, check_output: bool, timeout_factor: float, suite: BaseSuite, options: Optional[BaseRunOptions] = None) -> Dict[int, Tuple[BaseTest, BaseResult]]:
+		if options is None:
+			options = BaseRunOptions()
+
+		minimized: Dict[int, Tuple[BaseTest, BaseResult]] = {}
+		if self.__shrinker is None:
+			print("-- Minimization is not supported by this suite")
+			return minimized
+
+		with ThreadPoolExecutor(max_workers = max(1, options.jobs)) as pool:
+			for i, results in enumerate(suite.get_results()):
+				test, result = results
+				if result.ok() or result.get_errno() == Errno.ERROR_SKIPPED:
+					continue
+				print("-- Minimizing %s..." % (test.name))
+				smallest = self.__minimize_test(test, result.get_errno(), program, check_output, timeout_factor, pool, options)
+				if smallest is not None:
+					minimized[i] = smallest
+		return minimized
+
+	def __minimize_test(self, test: BaseTest, errno: Errno, program: str, check_output: bool, timeout_factor: float, pool: ThreadPoolExecutor, options: BaseRunOptions) -> Optional[Tuple[BaseTest, BaseResult]]:
+		jobs = max(1, options.jobs)
+		smallest: Optional[Tuple[BaseTest, BaseResult]] = None
+		runs = 0
+		candidates = iter(self.__shrinker(test))
+		while runs < self.MINIMIZE_MAX_RUNS:
+			# Candidates are run in portions of `jobs`, the first reproducing one (in order of candidates) wins.
+			portion = list(itertools.islice(candidates, min(jobs, self.MINIMIZE_MAX_RUNS - runs)))
+			if not portion:
+				break
+			results = list(pool.map(lambda candidate: candidate.run(program, check_output, timeout_factor, None, options.sandbox), portion))
+			runs += len(portion)
+			found = next(((candidate, result) for candidate, result in zip(portion, results) if result.get_errno() == errno), None)
+			if found is not None:
+				smallest = found
+				candidates = iter(self.__shrinker(found[0]))
+		return smallest
+
+	# Returns indices of tests in order of execution.
+	def __schedule(self, options: BaseRunOptions) -> List[int]:
+		order = list(range(len(self.__tests)))
+		if not options.smoke_first:
+			return order
+
+		# The cheapest test of each category, a test of several categories may be chosen for each of them.
+		cheapest: Dict[str, Tuple[int, int]] = {}
+		for i, test in enumerate(self.__tests):
+			cost = test.get_cost()
+			for category in test.categories:
+				if category not in cheapest or cost < cheapest[category][0]:
+					cheapest[category] = (cost, i)
+		smoke = sorted(set(i for _, i in cheapest.values()))
+		smoke_set = set(smoke)
+		return smoke + [i for i in order if i not in smoke_set]
+
+	# Results are always reported in the order tests were added.
+	def __make_suite(self, results: List[BaseResult]) -> BaseSuite:
 		suite = BaseSuite()
-		for test in self.__tests:
-			print("-- Performing %s..." % (test.name))
-			result = test.run(program, check_output, timeout_factor)
-			print(result)
+		for test, result in zip(self.__tests, results):
 			suite.add_result(test, result)
-
 		return suite
+
+	def __run_test(self, test: BaseTest, program: str, check_output: bool, timeout_factor: float, options: BaseRunOptions, session: Optional[BaseBatchSession]) -> BaseResult:
+		if not options.bench:
+			return test.run(program, check_output, timeout_factor, session, options.sandbox)
+
+		for _ in range(options.warmup):
+			test.run(program, check_output, timeout_factor, session, options.sandbox)
+
+		# Failed test is not repeated: its timing says nothing about the program's speed.
+		samples: List[int] = []
+		for _ in range(options.repeat):
+			result = test.run(program, check_output, timeout_factor, session, options.sandbox)
+			if result.wall_time_ns is not None:
+				samples.append(result.wall_time_ns)
+			if not result.ok():
+				break
+		result.samples = samples
+		return result
+
+	async def __run_test_async(self, test: BaseTest, program: str, check_output: bool, timeout_factor: float, options: BaseRunOptions) -> BaseResult:
+		if not options.bench:
+			return await test.run_async(program, check_output, timeout_factor, options.sandbox)
+
+		for _ in range(options.warmup):
+			await test.run_async(program, check_output, timeout_factor, options.sandbox)
+
+		samples: List[int] = []
+		for _ in range(options.repeat):
+			result = await test.run_async(program, check_output, timeout_factor, options.sandbox)
+			if result.wall_time_ns is not None:
+				samples.append(result.wall_time_ns)
+			if not result.ok():
+				break
+		result.samples = samples
+		return result
+
+	def __report_result(self, i: int, result: BaseResult, options: BaseRunOptions):
+		for line in result.log:
+			print(line)
+		print(result)
+		if options.on_result is not None:
+			options.on_result(i, self.__tests[i], result)
+		if options.release:
+			result.release()
@@ -1,3 +1,5 @@
+import random
+
 import testsuites.base as base
 
 from typing import Tuple, Optional, Dict, Iterable, List
@@ -12,6 +14,28 @@ __ALL_BAD_CATEGORIES = ["binary (neg)", "binary (UB/ID)", "(complex) (neg)"]
 
 __ALL_CATEGORIES = __ALL_GOOD_CATEGORIES + __ALL_BAD_CATEGORIES
 
+# Randomly generated tests (see `--fuzz`) are not taken into account in final sum.
+__FUZZ_CATEGORY = 'fuzz'
+__FUZZ_BAD_CATEGORY = 'fuzz (neg)'
+# Part of generated tests, which are broken into parser errors.
+__FUZZ_PARSER_ERRORS = 0.1
+
+E_SUPPORT = 1
+E_MATH = 2
+E_PARSER = 3
+
+__INT32_MIN = -2**31
+
+# Same as in Python: unary operators bind tighter than all binary ones except `**`.
+__BINARY_PRECEDENCE = {
+	'|': 1, '^': 2, '&': 3,
+	'<<': 4, '>>': 4,
+	'+': 5, '-': 5,
+	'*': 6, '/': 6, '%': 6,
+	'**': 8
+}
+__UNARY_PRECEDENCE = 7
+
 class __GoodComparator(base.BaseComparator):
 	def __init__(self):
 		super().__init__()
@@ -63,10 +87,6 @@ def __generate_bad_categorized_tests(category: str, tests: List[str]) -> List[Tu
 def __generate_bad_tests() -> Iterable[Tuple[str, str, __TestData]]:
 	generated: List[Tuple[str, str, __TestData]] = []
 
-	E_SUPPORT = 1
-	E_MATH = 2
-	E_PARSER = 3
-
 	tests = [
 		["* 2", E_PARSER], ["2 *", E_PARSER],
 		["/ 2", E_PARSER], ["2 /", E_PARSER],
@@ -317,16 +337,261 @@ def __generate_good_tests() -> Iterable[Tuple[str, str, __TestData]]:
 
 	return generated
 
-def get_instance() -> Tuple[base.BaseTester, Optional[Dict[str, float]]]:
+class __MathError(Exception):
+	pass
+
+# Expression tree: ('num', value), ('unary', op, operand) or ('binary', op, left, right).
+__Node = tuple
+
+def __wrap(x: int) -> int:
+	return (x - __INT32_MIN) % 2**32 + __INT32_MIN
+
+def __evaluate(node: __Node) -> int:
+	kind = node[0]
+	if kind == 'num':
+		return node[1]
+
+	if kind == 'unary':
+		op, x = node[1], __evaluate(node[2])
+		return x if op == '+' else __wrap(-x) if op == '-' else ~x
+
+	op, a, b = node[1], __evaluate(node[2]), __evaluate(node[3])
+	if op == '+':
+		return __wrap(a + b)
+	if op == '-':
+		return __wrap(a - b)
+	if op == '*':
+		return __wrap(a * b)
+	if op == '/' or op == '%':
+		if b == 0 or (a == __INT32_MIN and b == -1):
+			raise __MathError()
+		# Rounding toward zero, as in C.
+		q = abs(a) // abs(b) * (1 if (a < 0) == (b < 0) else -1)
+		return q if op == '/' else a - b * q
+	if op == '**':
+		if b < 0:
+			raise __MathError()
+		return __wrap(pow(a, b, 2**32))
+	if op == '<<' or op == '>>':
+		if b < 0 or b >= 32:
+			raise __MathError()
+		return __wrap(a << b) if op == '<<' else a >> b
+	if op == '&':
+		return a & b
+	if op == '|':
+		return a | b
+	return a ^ b
+
+def __random_literal(rng: random.Random) -> __Node:
+	# Mostly small numbers, sometimes large ones to get overflows.
+	return ('num', rng.randint(0, 100) if rng.random() < 0.8 else rng.randint(0, 2**31 - 1))
+
+def __random_expression(rng: random.Random, depth: int) -> __Node:
+	if depth == 0 or rng.random() < 0.25:
+		return __random_literal(rng)
+	if rng.random() < 0.2:
+		return ('unary', rng.choice('+-~'), __random_expression(rng, depth - 1))
+
+	op = rng.choice(list(__BINARY_PRECEDENCE))
+	left = __random_expression(rng, depth - 1)
+	# Power and shifts get small literals on the right (sometimes out of range), so the program never loops for too long.
+	if op == '**':
+		right = ('unary', '-', ('num', rng.randint(1, 3))) if rng.random() < 0.05 else ('num', rng.randint(0, 31))
+	elif op == '<<' or op == '>>':
+		right = ('num', rng.randint(32, 40)) if rng.random() < 0.05 else ('num', rng.randint(0, 31))
+	else:
+		right = __random_expression(rng, depth - 1)
+	return ('binary', op, left, right)
+
+def __render(node: __Node, rng: random.Random) -> str:
+	kind = node[0]
+	if kind == 'num':
+		return str(node[1])
+
+	if kind == 'unary':
+		operand = node[2]
+		if operand[0] == 'binary':
+			return "%s ( %s )" % (node[1], __render(operand, rng))
+		return node[1] + (rng.choice(['', ' ']) if operand[0] == 'num' else ' ') + __render(operand, rng)
+
+	op, left, right = node[1], node[2], node[3]
+	precedence = __BINARY_PRECEDENCE[op]
+	left_str = __render(left, rng)
+	right_str = __render(right, rng)
+	# Parentheses are put wherever associativity matters (`**` is always parenthesized), and around unary base of power.
+	if (left[0] == 'binary' and (__BINARY_PRECEDENCE[left[1]] < precedence or (op == '**' and __BINARY_PRECEDENCE[left[1]] == precedence))) or (left[0] == 'unary' and __UNARY_PRECEDENCE < precedence):
+		left_str = "( %s )" % (left_str)
+	if right[0] == 'binary' and __BINARY_PRECEDENCE[right[1]] <= precedence:
+		right_str = "( %s )" % (right_str)
+	return "%s %s %s" % (left_str, op, right_str)
+
+def __break_expression(expression: str, rng: random.Random) -> str:
+	# Only operators, which can't be unary, so the result is surely not an expression.
+	binary_only = ['*', '/', '%', '&', '|', '^', '<<', '>>', '**']
+	tokens = expression.split(' ')
+	operators = [i for i, token in enumerate(tokens) if token in binary_only]
+
+	# Tokens are only added, so whatever is parsed before the error is grouped as in the valid expression.
+	kind = rng.randrange(4)
+	if kind == 0:
+		if rng.random() < 0.5:
+			tokens.insert(0, '(')
+		else:
+			tokens.append(')')
+	elif kind == 1 and operators:
+		i = rng.choice(operators)
+		tokens.insert(i, tokens[i])
+	elif kind == 2:
+		tokens.insert(0, rng.choice(binary_only))
+	else:
+		tokens.append(rng.choice(binary_only))
+	return ' '.join(tokens)
+
+def __generate_fuzz_tests(count: int, depth: int, seed: int) -> Tuple[List[Tuple[str, str, __TestData]], List[Tuple[str, str, int, __TestData]]]:
+	good: List[Tuple[str, str, __TestData]] = []
+	bad: List[Tuple[str, str, int, __TestData]] = []
+	rng = random.Random(seed)
+
+	for i in range(count):
+		node = __random_expression(rng, depth)
+		while node[0] == 'num' and depth > 0:
+			node = __random_expression(rng, depth)
+		expression = __render(node, rng)
+		try:
+			value: Optional[int] = __evaluate(node)
+		except __MathError:
+			value = None
+
+		# Parser errors are made only from expressions without math errors, so it doesn't matter whether program evaluates while parsing.
+		if value is not None and rng.random() < __FUZZ_PARSER_ERRORS:
+			test = __TestData(__break_expression(expression, rng), "", E_PARSER)
+		elif value is None:
+			test = __TestData(expression, "", E_MATH)
+		else:
+			test = __TestData(expression, str(value))
+
+		if test.get_returncode() == 0:
+			good.append((f"{__FUZZ_CATEGORY} #{i}: '{test.get_input()}' -> '{test.get_expected()}'", __FUZZ_CATEGORY, test))
+		else:
+			bad.append((f"{__FUZZ_BAD_CATEGORY} #{i}: '{test.get_input()}'", __FUZZ_BAD_CATEGORY, test.get_returncode(), test))
+	return good, bad
+
+# Tokens with flags, whether they are written together with the next token.
+def __tokenize(expression: str) -> List[Tuple[str, bool]]:
+	tokens: List[Tuple[str, bool]] = []
+	for word in expression.replace('(', ' ( ').replace(')', ' ) ').split():
+		# Unary operators may be written together with their operand.
+		while len(word) > 1 and word[0] in '+-~':
+			tokens.append((word[0], True))
+			word = word[1:]
+		tokens.append((word, False))
+	return tokens
+
+# Returns None, if expression is not valid (or too deep to be parsed).
+def __parse(expression: str) -> Optional[__Node]:
+	tokens = __tokenize(expression)
+	position = 0
+
+	def peek() -> Optional[str]:
+		return tokens[position][0] if position < len(tokens) else None
+
+	def take() -> str:
+		nonlocal position
+		if position == len(tokens):
+			raise ValueError('unexpected end of expression')
+		position += 1
+		return tokens[position - 1][0]
+
+	# Operator written together with its right operand (as in `4 +8`) is unary only, so it can't follow an operand.
+	def peek_binary() -> Optional[str]:
+		return None if position < len(tokens) and tokens[position][1] else peek()
+
+	def parse_binary(precedence: int) -> __Node:
+		if precedence >= __UNARY_PRECEDENCE:
+			return parse_unary()
+		node = parse_binary(precedence + 1)
+		while __BINARY_PRECEDENCE.get(peek_binary()) == precedence:
+			op = take()
+			node = ('binary', op, node, parse_binary(precedence + 1))
+		return node
+
+	def parse_unary() -> __Node:
+		if peek() in ('+', '-', '~'):
+			op = take()
+			return ('unary', op, parse_unary())
+		node = parse_atom()
+		# Power is right-associative and its exponent may be unary.
+		if peek() == '**':
+			take()
+			return ('binary', '**', node, parse_unary())
+		return node
+
+	def parse_atom() -> __Node:
+		token = take()
+		if token == '(':
+			node = parse_binary(1)
+			if take() != ')':
+				raise ValueError('expected closing bracket')
+			return node
+		if token.isdigit():
+			return ('num', __wrap(int(token)))
+		raise ValueError('unexpected token')
+
+	try:
+		node = parse_binary(1)
+	except (ValueError, RecursionError):
+		return None
+	return node if position == len(tokens) else None
+
+# Trees, which differ from the given one by a single replacement of a subtree with its operand (or of a number with 0 or 1), the outermost first.
+def __reduce_expression(node: __Node) -> List[__Node]:
+	kind = node[0]
+	if kind == 'num':
+		return [('num', value) for value in (0, 1) if value != node[1]]
+	if kind == 'unary':
+		return [node[2]] + [('unary', node[1], reduced) for reduced in __reduce_expression(node[2])]
+	op, left, right = node[1], node[2], node[3]
+	return [left, right] \
+		+ [('binary', op, reduced, right) for reduced in __reduce_expression(left)] \
+		+ [('binary', op, left, reduced) for reduced in __reduce_expression(right)]
+
+def __shrink_test(test: base.BaseTest, good_comparator: base.BaseComparator) -> List[base.BaseTest]:
+	node = __parse(test.get_raw_input())
+	if node is None:
+		return []
+
+	category = test.categories[0]
+	rng = random.Random(0)
+	seen = set([test.get_raw_input()])
+	candidates: List[base.BaseTest] = []
+	for reduced in __reduce_expression(node):
+		expression = __render(reduced, rng)
+		if expression in seen:
+			continue
+		seen.add(expression)
+		try:
+			value = str(__evaluate(reduced))
+			candidates.append(test.derive(f"{category} (minimized): '{expression}' -> '{value}'", expression, value, comparator = good_comparator))
+		except __MathError:
+			candidates.append(test.derive(f"{category} (minimized): '{expression}'", expression, None, exitcode = E_MATH))
+	return candidates
+
+def get_instance(options: Optional[base.BaseSuiteOptions] = None) -> Tuple[base.BaseTester, Optional[Dict[str, float]]]:
 	TIMEOUT = 1.5
 
-	expression_tester = base.BaseTester(is_stdin_input = False, is_raw_input = True, is_raw_output = True)
+	if options is None:
+		options = base.BaseSuiteOptions()
 
 	good_tests = __generate_good_tests()
 	bad_tests = __generate_bad_tests()
+	fuzz_good_tests, fuzz_bad_tests = __generate_fuzz_tests(options.fuzz, options.fuzz_depth, options.seed)
+	good_tests += fuzz_good_tests
+	bad_tests += fuzz_bad_tests
 	coefficients = base.get_coefficients(SUITE_NAME, __ALL_CATEGORIES)
 	good_comparator = __GoodComparator()
 
+	expression_tester = base.BaseTester(is_stdin_input = False, is_raw_input = True, is_raw_output = True, supports_batch = True, shrinker = lambda test: __shrink_test(test, good_comparator))
+
 	for test_data in good_tests:
 		test_name, test_category, test = test_data
 		expression_tester.add_success(test_name, test.get_input(), test.get_expected(), timeout = TIMEOUT, categories = [test_category], comparator = good_comparator)
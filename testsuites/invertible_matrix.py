@@ -1,11 +1,13 @@
+import itertools
 import os
 import shutil
 import numpy as np
 
 import testsuites.base as base
 
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
-from typing import Tuple, Optional, Dict, Iterable, List, Union
+from typing import Tuple, Optional, Dict, Iterable, Iterator, List, Union
 
 SUITE_NAME = 'invertible-matrix'
 __SUITE_DIR = base.make_suite_dirname(SUITE_NAME)
@@ -15,6 +17,20 @@ __ALL_BAD_CATEGORIES = ['neg']
 
 __ALL_CATEGORIES = __ALL_GOOD_CATEGORIES + __ALL_BAD_CATEGORIES
 
+# Stress tests are generated only on demand and are not weighted in the final sum.
+__STRESS_CATEGORY = 'stress'
+__STRESS_SIZES = [256, 512, 1024, 2048, 3000]
+# Extra seconds per n^3 given to stress tests on top of the base timeout.
+__STRESS_TIME_PER_CUBE = 4e-9
+# Matrices with larger 1-norm condition number are regenerated.
+__STRESS_MAX_CONDITION = 1e8
+
+# Smaller variants of failed tests (see `--minimize`) are written here, numbered by `__MINIMIZE_COUNTER`.
+__MINIMIZE_CATEGORY = 'minimize'
+__MINIMIZE_COUNTER = itertools.count()
+# Indices are split into at most this number of chunks: finer variants are rarely smaller by much, but there are many of them.
+__MINIMIZE_MAX_CHUNKS = 8
+
 # (<subdir name>, <file ext>)
 class __TestType(Enum):
 	IN = ('in', 'in')
@@ -55,37 +71,51 @@ class __GoodComparator(base.BaseComparator):
 			return base.BaseResult(base.Errno.ERROR_TYPE_ERROR, what = "R/C should be integers")
 
 		# Comparison matrices.
-		nested_actual_matrix = [s.strip().split(' ') for s in actual[1:]]
-		nested_expected_matrix = [s.strip().split(' ') for s in expected[1:]]
+		actual_matrix = self.__parse(actual[1:], r, c)
+		expected_matrix = self.__parse(expected[1:], r, c)
+		if actual_matrix is None or expected_matrix is None:
+			return self.__diagnose(actual[1:], expected[1:], r, c)
+
+		# Difference is normalized by the smaller of row's and column's maximum absolute value.
+		max_abs = np.fmax(np.abs(expected_matrix), np.abs(actual_matrix))
+		scale = np.minimum(np.amax(max_abs, axis = 1)[:, np.newaxis], np.amax(max_abs, axis = 0)[np.newaxis, :])
+		diff = np.abs(actual_matrix - expected_matrix)
+		deviation = np.divide(diff, scale, out = np.zeros_like(diff), where = diff != 0)
+		deviation[np.isnan(deviation)] = np.inf
+
+		mismatched = np.count_nonzero(deviation > DELTA)
+		if mismatched != 0:
+			y, x = np.unravel_index(np.argmax(deviation), deviation.shape)
+			return base.BaseResult(
+				base.Errno.ERROR_ASSERTION,
+				what = "at (row, column)=(%d, %d) position should be %f (+/-%f), but found %f (the worst of %d mismatched elements)" % (y, x, float(expected_matrix[y][x]), DELTA, float(actual_matrix[y][x]), mismatched)
+			)
+
+		return base.err_ok()
 
+	# Returns None, if rows are not a well-formed R x C matrix of numbers.
+	def __parse(self, rows: List[str], r: int, c: int) -> Optional[np.ndarray]:
+		try:
+			matrix = np.loadtxt(rows, dtype = float, comments = None, ndmin = 2)
+		except ValueError:
+			return None
+		return matrix if matrix.shape == (r, c) else None
+
+	# Slow path: finds out why rows could not be parsed.
+	def __diagnose(self, actual_rows: List[str], expected_rows: List[str], r: int, c: int) -> base.BaseResult:
 		for i in range(r):
-			if len(nested_actual_matrix[i]) != len(nested_expected_matrix[i]):
+			actual_row = actual_rows[i].split()
+			expected_row = expected_rows[i].split()
+			if len(actual_row) != len(expected_row):
 				return base.BaseResult(
 					base.Errno.ERROR_ASSERTION,
-					what = "expected number of columns %d on row #%d is not equals to actual (%d)" % (len(nested_expected_matrix[i]), i, len(nested_actual_matrix[i]))
+					what = "expected number of columns %d on row #%d is not equals to actual (%d)" % (len(expected_row), i, len(actual_row))
 				)
-
-		actual_matrix = np.array([[float(j) for j in i] for i in nested_actual_matrix])
-		expected_matrix = np.array([[float(j) for j in i] for i in nested_expected_matrix])
-
-		max_abs = np.fmax(np.abs(expected_matrix), np.abs(actual_matrix))
-		max_by_row = np.amax(max_abs, axis = 1)
-		max_by_col = np.amax(max_abs, axis = 0)
-
-		for y in range(r):
-			for x in range(c):
-				a = actual_matrix[y][x]
-				e = expected_matrix[y][x]
-				diff = abs(a - e)
-				m = min(max_by_row[y], max_by_col[x])
-				d = diff / m
-				if d > DELTA:
-					return base.BaseResult(
-						base.Errno.ERROR_ASSERTION,
-						what = "at (row, column)=(%d, %d) position should be %f (+/-%f), but found %f" % (y, x, float(e), DELTA, float(a))
-					)
-
-		return base.err_ok()
+			for j, value in enumerate(actual_row):
+				# Numbers are checked by the same parser, as whole matrices, so both paths agree on what a number is.
+				if self.__parse([value], 1, 1) is None:
+					return base.err_type_error(i, j, 'floating point number')
+		return base.err_unknown("reference matrix is malformed")
 
 def __make_basename(type: __TestType, name: Union[int, str]) -> str:
 	return "test_%s.%s" % (str(name), type.value[1])
@@ -131,10 +161,12 @@ def __read_mtx(filename: str, dtype = float):
 	return m
 
 def __create_test_files(test_case: str, test_idx: int, mtx, fmt: str = '%g') -> Tuple[str, str, str]:
+	# Reference is computed for the matrix exactly as it is written (after formatting), without reading it back.
+	written_mtx = np.char.mod(fmt, mtx).astype(float)
 	input_mtx_file = __make_in_path(test_case, test_idx)
-	__write_mtx(mtx, input_mtx_file, fmt = fmt)
+	__write_mtx(written_mtx, input_mtx_file, fmt = fmt)
 	ref_mtx_file = __make_ref_path(test_case, test_idx)
-	inverted_mtx = np.linalg.inv(__read_mtx(input_mtx_file))
+	inverted_mtx = np.linalg.inv(written_mtx)
 	__write_mtx(inverted_mtx, ref_mtx_file, fmt = fmt)
 	return input_mtx_file, __make_out_path(test_case, test_idx), ref_mtx_file
 
@@ -148,122 +180,89 @@ def __full_cleanup(category: str):
 	__cleanup(__make_ref_path(category))
 	__cleanup(__make_out_path(category))
 
-def __generate_bad_tests() -> Iterable[Tuple[str, str, str, int]]:
-	generated: List[Tuple[str, str, str, int]] = []
+def __generate_bad_tests() -> Iterable[Tuple[str, str, str, str, int]]:
+	generated: List[Tuple[str, str, str, str, int]] = []
 
 	category = 'neg'
 
 	empty_file_raw_input = __make_in_path(category, 1)
 	with open(empty_file_raw_input, 'w') as file:
 		file.write('\n')
-	test_data = ('Empty file', category, empty_file_raw_input, 1)
+	test_data = ('Empty file', category, empty_file_raw_input, __make_out_path(category, 1), 1)
 	generated.append(test_data)
 
 	return generated
 
-def __generate_good_tests() -> Iterable[Tuple[str, str, str, str, str, base.BaseComparator]]:
-	generated: List[Tuple[str, str, str, str, str, base.BaseComparator]] = []
-
-	category = 'eye'
-	__full_cleanup(category)
-	sizes_1 = [1, 2, 5, 11, 26, 51, 73, 100]
-	for i in range(len(sizes_1)):
-		m = np.eye(sizes_1[i])
-		raw_input, raw_output, raw_expected = __create_test_files(category, i, m)
-		test_data = (f"{category.capitalize()} #{i}", category, raw_input, raw_output, raw_expected, __GoodComparator)
-		generated.append(test_data)
-
-	category = 'diag'
-	__full_cleanup(category)
-	sizes_2 = [1, 5, 23, 44, 53, 78, 100]
-	for i in range(len(sizes_2)):
-		m = np.eye(sizes_2[i])
-		for j in range(sizes_2[i]):
-			m[j][j] = np.random.randint(-100, 100)
-			if m[j][j] == 0:
-				m[j][j] = 1
-		raw_input, raw_output, raw_expected = __create_test_files(category, i, m)
-		test_data = (f"{category.capitalize()} #{i}", category, raw_input, raw_output, raw_expected, __GoodComparator)
-		generated.append(test_data)
-
-	category = 'normal'
-	__full_cleanup(category)
-	sizes_3 = [2, 3, 5, 7, 11,
-			  13, 17, 19, 23, 29,
-			  31, 37, 41, 43, 47,
-			  53, 59, 61, 67, 71,
-			  73, 79, 83, 89, 93,
-			  97, 101, 103, 110]
-	for i in range(len(sizes_3)):
-		m = np.zeros((sizes_3[i], sizes_3[i]))
-		while np.linalg.det(m) == 0:
-			for j in range(sizes_3[i]):
-				for k in range(sizes_3[i]):
-					m[j][k] = np.random.randint(-100, 100)
-		raw_input, raw_output, raw_expected = __create_test_files(category, i, m)
-		test_data = (f"{category.capitalize()} #{i}", category, raw_input, raw_output, raw_expected, __GoodComparator)
-		generated.append(test_data)
-
-	category = 'ort'
-	__full_cleanup(category)
-	sizes_4 = [1, 7, 24, 56, 77, 102]
-	for i in range(len(sizes_4)):
-		m = np.zeros((sizes_4[i], sizes_4[i]))
-		while np.linalg.det(m) == 0:
-			for j in range(sizes_4[i]):
-				m[j][sizes_4[i] - j - 1] = np.random.randint(-100, 100)
-		raw_input, raw_output, raw_expected = __create_test_files(category, i, m)
-		test_data = (f"{category.capitalize()} #{i}", category, raw_input, raw_output, raw_expected, __GoodComparator)
-		generated.append(test_data)
-
-	category = 'frac'
-	__full_cleanup(category)
-	sizes_5 = [3, 4, 6, 9, 12,
-			  15, 18, 20, 24, 30,
-			  34, 38, 42, 46, 50,
-			  55, 60, 64, 82, 85, 90]
-	for i in range(len(sizes_5)):
-		m = np.zeros((sizes_5[i], sizes_5[i]))
-		while np.linalg.det(m) == 0:
-			for j in range(sizes_5[i]):
-				for k in range(sizes_5[i]):
-					m[j][k] = np.random.uniform(-100, 100)
-		raw_input, raw_output, raw_expected = __create_test_files(category, i, m)
-		test_data = (f"{category.capitalize()} #{i}", category, raw_input, raw_output, raw_expected, __GoodComparator)
-		generated.append(test_data)
-
-	category = 'triangle'
-	__full_cleanup(category)
-	sizes_6 = [4, 7, 11, 22, 30,
-			   3, 5, 6, 7, 8,
-			   5, 8, 14, 35, 45,
-			   4, 5, 6, 7, 8]
-	for i in range(len(sizes_6)):
-		m = np.zeros((sizes_6[i], sizes_6[i]))
-		while np.linalg.det(m) == 0:
-			for j in range(sizes_6[i]):
-				for k in range(j, sizes_6[i]):
-					if i < 5:
-						m[j][k] = np.random.uniform(-50, 50)
-					elif i < 10:
-						m[k][j] = np.random.uniform(-10, 10)
-					elif i < 15:
-						m[sizes_6[i] - j - 1][k] = np.random.uniform(-100, 100)
-					elif i < 20:
-						m[j][sizes_6[i] - k - 1] = np.random.uniform(-100, 100)
-		raw_input, raw_output, raw_expected = __create_test_files(category, i, m)
-		test_data = (f"{category.capitalize()} #{i}", category, raw_input, raw_output, raw_expected, __GoodComparator)
-		generated.append(test_data)
-
-	def __hilbert_matrix(n: int):
-		return np.array([[1 / (i + j + 1) for j in range(n)] for i in range(n)])
+# Matrix of the given kind, all random values are taken from `rng`.
+def __make_good_mtx(kind: str, i: int, n: int, rng: np.random.Generator) -> np.ndarray:
+	if kind == 'eye':
+		return np.eye(n)
+	if kind == 'hilbert':
+		return np.array([[1 / (j + k + 1) for k in range(n)] for j in range(n)])
+	if kind == 'diag':
+		diagonal = rng.integers(-100, 100, size = n)
+		diagonal[diagonal == 0] = 1
+		return np.diag(diagonal).astype(float)
+	if kind == 'normal':
+		return __random_invertible_mtx(n, rng)[0]
+
+	# Only singular matrices are regenerated, so graded categories keep their distributions (their sizes are small for `det` to overflow).
+	m = np.zeros((n, n))
+	while np.linalg.det(m) == 0:
+		if kind == 'ort':
+			m = np.fliplr(np.diag(rng.integers(-100, 100, size = n))).astype(float)
+		elif kind == 'frac':
+			m = rng.uniform(-100, 100, size = (n, n))
+		elif kind == 'triangle':
+			# Upper, lower and two mirrored triangular matrices by 5 tests each.
+			limit = 50 if i < 5 else 10 if i < 10 else 100
+			upper = np.triu(rng.uniform(-limit, limit, size = (n, n)))
+			m = [upper, upper.T, np.flipud(upper), np.fliplr(upper)][i // 5]
+		else:
+			raise ValueError("[FATAL ERROR] Unknown kind of matrix \"%s\"." % (kind))
+	return m
 
-	sizes_7 = [3, 4]
-	for i in range(len(sizes_7)):
-		m = __hilbert_matrix(sizes_7[i])
-		raw_input, raw_output, raw_expected = __create_test_files('frac', i + len(sizes_5), m, '%.12g')
-		test_data = (f"{category.capitalize()} #{i}", category, raw_input, raw_output, raw_expected, __GoodComparator)
-		generated.append(test_data)
+# Runs in a worker process: each test has its own random stream, so files do not depend on the order tests are generated in.
+def __generate_good_test(kind: str, category: str, i: int, n: int, fmt: str, seed: np.random.SeedSequence) -> Tuple[str, str, str]:
+	m = __make_good_mtx(kind, i, n, np.random.default_rng(seed))
+	return __create_test_files(category, i, m, fmt)
+
+def __generate_good_tests(pool: ProcessPoolExecutor, seed: np.random.SeedSequence) -> Iterable[Tuple[str, str, str, str, str]]:
+	generated: List[Tuple[str, str, str, str, str]] = []
+
+	sizes: Dict[str, List[int]] = {
+		'eye': [1, 2, 5, 11, 26, 51, 73, 100],
+		'diag': [1, 5, 23, 44, 53, 78, 100],
+		'normal': [2, 3, 5, 7, 11,
+				   13, 17, 19, 23, 29,
+				   31, 37, 41, 43, 47,
+				   53, 59, 61, 67, 71,
+				   73, 79, 83, 89, 93,
+				   97, 101, 103, 110],
+		'ort': [1, 7, 24, 56, 77, 102],
+		'frac': [3, 4, 6, 9, 12,
+				 15, 18, 20, 24, 30,
+				 34, 38, 42, 46, 50,
+				 55, 60, 64, 82, 85, 90],
+		'triangle': [4, 7, 11, 22, 30,
+					 3, 5, 6, 7, 8,
+					 5, 8, 14, 35, 45,
+					 4, 5, 6, 7, 8],
+	}
+
+	# (<name>, <category>, <kind of matrix>, <category of files>, <index>, <size>, <format>)
+	tests: List[Tuple[str, str, str, str, int, int, str]] = []
+	for category, category_sizes in sizes.items():
+		__full_cleanup(category)
+		tests += [(f"{category.capitalize()} #{i}", category, category, category, i, n, '%g') for i, n in enumerate(category_sizes)]
+	# Hilbert matrices are counted as triangle ones, but their files are kept together with fractional ones.
+	tests += [(f"Triangle #{i}", 'triangle', 'hilbert', 'frac', i + len(sizes['frac']), n, '%.12g') for i, n in enumerate([3, 4])]
+
+	kinds, categories, indices, test_sizes, fmts = zip(*[test[2:] for test in tests])
+	files = pool.map(__generate_good_test, kinds, categories, indices, test_sizes, fmts, seed.spawn(len(tests)))
+	for test, test_files in zip(tests, files):
+		raw_input, raw_output, raw_expected = test_files
+		generated.append((test[0], test[1], raw_input, raw_output, raw_expected))
 
 	category = 'neg'
 	__full_cleanup(category)
@@ -282,26 +281,139 @@ def __generate_good_tests() -> Iterable[Tuple[str, str, str, str, str, base.Base
 		__write_mtx(m, raw_input)
 		with open(raw_expected, 'w') as file:
 			file.write('no_solution\n')
-		test_data = (f"{category.capitalize()} #{i + 2}", category, raw_input, raw_output, raw_expected, base.BaseComparator)
+		test_data = (f"{category.capitalize()} #{i + 2}", category, raw_input, raw_output, raw_expected)
 		generated.append(test_data)
 
 	return generated
 
-def get_instance() -> Tuple[base.BaseTester, Optional[Dict[str, float]]]:
-	TIMEOUT = 0.5
+def __random_invertible_mtx(n: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+	# Instead of `det` (which overflows at scale) matrix is inverted right away and its condition number is estimated by 1-norms.
+	while True:
+		m = rng.integers(-100, 100, size = (n, n)).astype(float)
+		try:
+			inverted_m = np.linalg.inv(m)
+		except np.linalg.LinAlgError:
+			continue
+		if np.linalg.norm(m, 1) * np.linalg.norm(inverted_m, 1) < __STRESS_MAX_CONDITION:
+			return m, inverted_m
+
+# Runs in a worker process, see `__generate_good_test`.
+def __generate_stress_test(i: int, n: int, seed: np.random.SeedSequence) -> Tuple[str, str, str]:
+	m, inverted_m = __random_invertible_mtx(n, np.random.default_rng(seed))
+	raw_input = __make_in_path(__STRESS_CATEGORY, i)
+	raw_expected = __make_ref_path(__STRESS_CATEGORY, i)
+	# Integer input is written exactly, so the reference is the inverse of the very same matrix.
+	__write_mtx(m, raw_input, fmt = '%d')
+	__write_mtx(inverted_m, raw_expected)
+	return raw_input, __make_out_path(__STRESS_CATEGORY, i), raw_expected
+
+def __generate_stress_tests(pool: ProcessPoolExecutor, seed: np.random.SeedSequence, stress: bool) -> Iterable[Tuple[str, str, str, str, str, int]]:
+	generated: List[Tuple[str, str, str, str, str, int]] = []
+
+	category = __STRESS_CATEGORY
+	__full_cleanup(category)
+	if not stress:
+		return generated
 
-	invertible_matrix_tester = base.BaseTester(is_stdin_input = False, is_raw_input = True, is_raw_output = False)
+	files = pool.map(__generate_stress_test, range(len(__STRESS_SIZES)), __STRESS_SIZES, seed.spawn(len(__STRESS_SIZES)))
+	for i, (n, test_files) in enumerate(zip(__STRESS_SIZES, files)):
+		raw_input, raw_output, raw_expected = test_files
+		test_data = (f"{category.capitalize()} #{i} ({n}x{n})", category, raw_input, raw_output, raw_expected, n)
+		generated.append(test_data)
 
-	good_tests = __generate_good_tests()
-	bad_tests = __generate_bad_tests()
+	return generated
+
+# Principal submatrices (same rows and columns are kept) of n x n matrix as in delta debugging: for 2, 4, ... (up to `__MINIMIZE_MAX_CHUNKS`) chunks of indices,
+# each chunk alone and then everything except each chunk.
+def __reduce_indices(n: int) -> List[List[int]]:
+	reduced: List[List[int]] = []
+	seen = set([tuple(range(n))])
+	chunks_count = 2
+	while chunks_count <= min(n, __MINIMIZE_MAX_CHUNKS):
+		chunks = [chunk.tolist() for chunk in np.array_split(np.arange(n), chunks_count)]
+		complements = [[i for i in range(n) if i not in chunk] for chunk in chunks]
+		for indices in chunks + complements:
+			if len(indices) > 0 and tuple(indices) not in seen:
+				seen.add(tuple(indices))
+				reduced.append(indices)
+		chunks_count *= 2
+	return reduced
+
+# Variants are generated lazily: their files are written only when they are going to be run.
+def __shrink_test(test: base.BaseTest) -> Iterator[base.BaseTest]:
+	category = test.categories[0]
+	test_input = test.get_raw_input()
+	if category not in __ALL_GOOD_CATEGORIES + __ALL_BAD_CATEGORIES or not isinstance(test_input, list):
+		return
+	try:
+		m = __read_mtx(test_input[0])
+	except ValueError:
+		return
+	n = m.shape[0]
+	if m.shape != (n, n):
+		return
+
+	for indices in __reduce_indices(n):
+		sub_m = m[np.ix_(indices, indices)]
+		singular = np.linalg.matrix_rank(sub_m) < len(indices)
+		# Singular matrices are kept for tests expecting no solution, well-conditioned invertible ones - for others.
+		if category in __ALL_BAD_CATEGORIES:
+			if not singular:
+				continue
+		elif singular or np.linalg.cond(sub_m, 1) >= __STRESS_MAX_CONDITION:
+			continue
+
+		# Files of the previous run are removed before the first variant is written.
+		k = next(__MINIMIZE_COUNTER)
+		if k == 0:
+			__full_cleanup(__MINIMIZE_CATEGORY)
+		name = f"{category.capitalize()} (minimized, {len(indices)}x{len(indices)})"
+		if category in __ALL_BAD_CATEGORIES:
+			raw_input, raw_output, raw_expected = __make_in_path(__MINIMIZE_CATEGORY, k), __make_out_path(__MINIMIZE_CATEGORY, k), __make_ref_path(__MINIMIZE_CATEGORY, k)
+			__write_mtx(sub_m, raw_input, fmt = '%.12g')
+			with open(raw_expected, 'w') as file:
+				file.write('no_solution\n')
+		else:
+			raw_input, raw_output, raw_expected = __create_test_files(__MINIMIZE_CATEGORY, k, sub_m, '%.12g')
+		yield test.derive(name, [raw_input, raw_output], raw_expected, output_stream = raw_output)
+
+def get_instance(options: Optional[base.BaseSuiteOptions] = None) -> Tuple[base.BaseTester, Optional[Dict[str, float]]]:
+	TIMEOUT = 0.5
+
+	invertible_matrix_tester = base.BaseTester(is_stdin_input = False, is_raw_input = True, is_raw_output = False, shrinker = __shrink_test)
+
+	stress = options is not None and options.stress
+	seed = options.seed if options is not None else 0
+
+	cache = base.BaseFixtureCache(__SUITE_DIR, { 'seed': seed, 'stress': stress }, [__file__])
+	fixtures = cache.load()
+	if fixtures is None:
+		# Regular and stress tests have separate random streams, so adding stress tests does not change regular ones.
+		good_seed, stress_seed = np.random.SeedSequence(seed).spawn(2)
+		with ProcessPoolExecutor() as pool:
+			good_tests = __generate_good_tests(pool, good_seed)
+			stress_tests = __generate_stress_tests(pool, stress_seed, stress)
+		bad_tests = __generate_bad_tests()
+		fixtures = (good_tests, bad_tests, stress_tests)
+		cache.store(fixtures, [t[2] for t in good_tests + stress_tests] + [t[4] for t in good_tests + stress_tests] + [t[2] for t in bad_tests])
+	else:
+		for category in __ALL_CATEGORIES + [__STRESS_CATEGORY]:
+			__cleanup(__make_out_path(category))
+	good_tests, bad_tests, stress_tests = fixtures
 	coefficients = base.get_coefficients(SUITE_NAME, __ALL_CATEGORIES)
 
 	for test_data in good_tests:
-		test_name, test_category, test_input, test_output, test_expected, test_comparator = test_data
-		invertible_matrix_tester.add_success(test_name, [test_input, test_output], test_expected, test_output, categories = [test_category], comparator = test_comparator(), timeout = TIMEOUT)
+		test_name, test_category, test_input, test_output, test_expected = test_data
+		test_comparator = base.BaseComparator() if test_category in __ALL_BAD_CATEGORIES else __GoodComparator()
+		invertible_matrix_tester.add_success(test_name, [test_input, test_output], test_expected, test_output, categories = [test_category], comparator = test_comparator, timeout = TIMEOUT)
+
+	for test_data in stress_tests:
+		test_name, test_category, test_input, test_output, test_expected, test_size = test_data
+		test_timeout = TIMEOUT + __STRESS_TIME_PER_CUBE * test_size ** 3
+		invertible_matrix_tester.add_success(test_name, [test_input, test_output], test_expected, test_output, categories = [test_category], comparator = __GoodComparator(), timeout = test_timeout)
 
 	for test_data in bad_tests:
-		test_name, test_category, test_input, test_exitcode = test_data
-		invertible_matrix_tester.add_failed(test_name, [test_input, "non_existing.out"], test_exitcode, timeout = TIMEOUT, categories = [test_category])
+		test_name, test_category, test_input, test_output, test_exitcode = test_data
+		invertible_matrix_tester.add_failed(test_name, [test_input, test_output], test_exitcode, timeout = TIMEOUT, categories = [test_category])
 
 	return invertible_matrix_tester, coefficients
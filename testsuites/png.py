@@ -1,6 +1,7 @@
 import os
 import shutil
-from PIL import Image, ImageChops
+import threading
+from PIL import Image
 
 import testsuites.base as base
 
@@ -29,8 +30,10 @@ class __GoodComparator(base.BaseComparator):
 	__PILType = { "RGB": 2, "L": 0, "P": 3 }
 	__TestType = TestType
 
+	# One comparator is shared by all tests of the suite instance, so that each expected image is decoded once.
 	def __init__(self):
-		pass
+		self.__expected_images: Dict[str, Image.Image] = {}
+		self.__expected_images_lock = threading.Lock()
 
 	def compare(self, actual: base.ContentT, expected: base.ContentT) -> base.BaseResult:
 		if not isinstance(actual, base.BaseMeta) or not isinstance(expected, base.BaseMeta) or not isinstance(actual.meta, list) or not isinstance(expected.meta, str):
@@ -39,37 +42,48 @@ class __GoodComparator(base.BaseComparator):
 		actual_file = actual.meta[1]
 		expected_file = expected.meta
 
-		actual_image = Image.open(actual_file)
-		actual_format, actual_size, actual_mode = actual_image.format, actual_image.size, actual_image.mode
+		with Image.open(actual_file) as actual_image:
+			actual_format, actual_size, actual_mode = actual_image.format, actual_image.size, actual_image.mode
 
-		if actual_format != 'PNG':
-			return base.BaseResult(base.Errno.ERROR_TYPE_ERROR, what = f"output file '{actual_file}' is not PNG")
-		
-		if actual_mode != 'RGB' and "_rgb." in expected_file:
-			return base.BaseResult(base.Errno.ERROR_TYPE_ERROR, what = f"expected RGB (colortype 2) image, but actual output file '{actual_file}' is {self.__PILType[actual_mode]} mode")
+			if actual_format != 'PNG':
+				return base.BaseResult(base.Errno.ERROR_TYPE_ERROR, what = f"output file '{actual_file}' is not PNG")
 
-		if actual_mode != 'L' and "_gray." in expected_file:
-			return base.BaseResult(base.Errno.ERROR_TYPE_ERROR, what = f"expected grayscale (colortype 0) image, but actual output file '{actual_file}' is {self.__PILType[actual_mode]} mode")
+			if actual_mode != 'RGB' and "_rgb." in expected_file:
+				return base.BaseResult(base.Errno.ERROR_TYPE_ERROR, what = f"expected RGB (colortype 2) image, but actual output file '{actual_file}' is {self.__PILType[actual_mode]} mode")
 
-		if actual_mode != 'P' and "_plt." in expected_file:
-			return base.BaseResult(base.Errno.ERROR_TYPE_ERROR, what = f"expected paletted (colortype 3) image, but actual output file '{actual_file}' is {self.__PILType[actual_mode]} mode")
+			if actual_mode != 'L' and "_gray." in expected_file:
+				return base.BaseResult(base.Errno.ERROR_TYPE_ERROR, what = f"expected grayscale (colortype 0) image, but actual output file '{actual_file}' is {self.__PILType[actual_mode]} mode")
 
-		actual_image.convert('RGB').save(actual_file + ".ppm", format="PPM")
-		
-		expected_image = Image.open(expected_file)
+			if actual_mode != 'P' and "_plt." in expected_file:
+				return base.BaseResult(base.Errno.ERROR_TYPE_ERROR, what = f"expected paletted (colortype 3) image, but actual output file '{actual_file}' is {self.__PILType[actual_mode]} mode")
+
+			rgb_actual_image = actual_image.convert('RGB')
+
+		rgb_expected_image = self.__load_expected(expected_file)
+
+		if rgb_actual_image.size == rgb_expected_image.size and rgb_actual_image.tobytes() == rgb_expected_image.tobytes():
+			return base.err_ok()
+
+		# Raw images are dumped only for failed tests.
+		rgb_actual_image.save(actual_file + ".ppm", format = "PPM")
 		renamed_expected_file = expected_file.replace(os.path.join('png', self.__TestType.REF.value), os.path.join('png', self.__TestType.REF_TMP.value))
-		expected_image.convert('RGB').save(renamed_expected_file + ".ppm", format = "PPM")
+		rgb_expected_image.save(renamed_expected_file + ".ppm", format = "PPM")
 
-		ppm_actual_image = Image.open(actual_file + ".ppm")
-		ppm_expected_image = Image.open(renamed_expected_file + ".ppm")
+		if rgb_actual_image.size != rgb_expected_image.size:
+			return base.BaseResult(base.Errno.ERROR_ASSERTION, what = f"expected image size {rgb_expected_image.size[0]}x{rgb_expected_image.size[1]}, but actual is {actual_size[0]}x{actual_size[1]}, see raw images: expected '{renamed_expected_file + '.ppm'}', actual '{actual_file + '.ppm'}'")
 
-		diff = ImageChops.difference(ppm_actual_image, ppm_expected_image)
-		channels = diff.split()
-		for channel in channels:
-			if channel.getbbox() is not None:
-				return base.BaseResult(base.Errno.ERROR_ASSERTION, what = f"expected != actual, see raw images: expected '{renamed_expected_file + '.ppm'}', actual '{actual_file + '.ppm'}'")
+		return base.BaseResult(base.Errno.ERROR_ASSERTION, what = f"expected != actual, see raw images: expected '{renamed_expected_file + '.ppm'}', actual '{actual_file + '.ppm'}'")
 
-		return base.err_ok()
+	# Cache hit does no I/O: images are keyed by path.
+	def __load_expected(self, expected_file: str) -> Image.Image:
+		key = os.path.abspath(expected_file)
+		with self.__expected_images_lock:
+			image = self.__expected_images.get(key)
+			if image is None:
+				with Image.open(key) as expected_image:
+					image = expected_image.convert('RGB')
+				self.__expected_images[key] = image
+			return image
 
 def __make_basename(type: __TestType, name: Union[int, str]) -> str:
 	return "%s" % (str(name))
@@ -117,8 +131,8 @@ def __full_cleanup(category: str):
 	__cleanup(__make_out_path(category))
 	__cleanup(__make_ref_tmp_path(category))
 
-def __generate_bad_tests() -> Iterable[Tuple[str, str, str, int]]:
-	generated: List[Tuple[str, str, str, int]] = []
+def __generate_bad_tests() -> Iterable[Tuple[str, str, str, str, int]]:
+	generated: List[Tuple[str, str, str, str, int]] = []
 
 	category = 'neg'
 	__full_cleanup(category)
@@ -131,7 +145,7 @@ def __generate_bad_tests() -> Iterable[Tuple[str, str, str, int]]:
 	__full_cleanup(category)
 	for i, t in enumerate(tests):
 		test_data = (f"{category} #{i + 1}: '{t[0]}'", category,
-						 __make_in_path(category, t[0]), t[1])
+						 __make_in_path(category, t[0]), __make_out_path(category, t[0]), t[1])
 		generated.append(test_data)
 	return generated
 
@@ -174,7 +188,7 @@ def __generate_good_tests() -> Iterable[Tuple[str, str, str, str, str, base.Base
 	])
 	return generated
 
-def get_instance() -> Tuple[base.BaseTester, Optional[Dict[str, float]]]:
+def get_instance(options: Optional[base.BaseSuiteOptions] = None) -> Tuple[base.BaseTester, Optional[Dict[str, float]]]:
 	TIMEOUT = 1.0
 
 	png_tester = base.BaseTester(is_stdin_input = False, is_raw_input = True, is_raw_output = False, testing_type = base.BaseTestingType.T_META)
@@ -183,12 +197,13 @@ def get_instance() -> Tuple[base.BaseTester, Optional[Dict[str, float]]]:
 	bad_tests = __generate_bad_tests()
 	coefficients = base.get_coefficients(SUITE_NAME, __ALL_CATEGORIES)
 
+	comparator = __GoodComparator()
 	for test_data in good_tests:
 		test_name, test_category, test_input, test_output, test_expected = test_data
-		png_tester.add_success(test_name, [test_input, test_output], test_expected, categories = [test_category], comparator = __GoodComparator(), timeout = TIMEOUT)
+		png_tester.add_success(test_name, [test_input, test_output], test_expected, test_output, categories = [test_category], comparator = comparator, timeout = TIMEOUT)
 
 	for test_data in bad_tests:
-		test_name, test_category, test_input, test_exitcode = test_data
+		test_name, test_category, test_input, test_output, test_exitcode = test_data
 		png_tester.add_failed(test_name, [test_input, test_output], test_exitcode, categories = [test_category], timeout = TIMEOUT)
 
 	return png_tester, coefficients
@@ -1,3 +1,5 @@
+import random
+
 import testsuites.base as base
 
 from typing import Tuple, Optional, Dict, Iterable, List
@@ -9,6 +11,24 @@ __ALL_BAD_CATEGORIES = ['neg']
 
 __ALL_CATEGORIES = __ALL_GOOD_CATEGORIES + __ALL_BAD_CATEGORIES
 
+# Randomly generated tests (see `--fuzz`) are not taken into account in final sum.
+__FUZZ_CATEGORY = 'fuzz'
+
+# Longer values are shortened in test names.
+__NAME_VALUE_LIMIT = 24
+
+__INT128_MIN = -2**127
+# Conversion: (base, prefix for `#` flag, digits).
+__FUZZ_CONVERSIONS = {
+	'd': (10, '', '0123456789'),
+	'x': (16, '0x', '0123456789abcdef'),
+	'X': (16, '0X', '0123456789ABCDEF'),
+	'o': (8, '0', '01234567'),
+	'b': (2, '0b', '01')
+}
+# Input notation: (base, prefix, maximum number of digits of 128-bit value).
+__FUZZ_NOTATIONS = [(10, '', 39), (16, '0x', 32), (16, '0X', 32), (8, '0', 43), (2, '0b', 128)]
+
 class __GoodComparator(base.BaseComparator):
 	def __init__(self):
 		super().__init__()
@@ -64,6 +84,16 @@ def __generate_answer(fmt: str, value_str: str):
 		res = formatter(value)
 	return res
 
+def __shorten(x: str) -> str:
+	return x if len(x) <= __NAME_VALUE_LIMIT else x[:__NAME_VALUE_LIMIT - 3] + '...'
+
+# Long values are shortened, full ones are in test's input and reference anyway.
+def __make_name(category: str, i: int, test: __TestData) -> str:
+	name = "%s #%d: %s" % (category, i, ' '.join('"%s"' % (__shorten(x)) for x in test.get_input()))
+	if not test.is_failed():
+		name += " -> '%s'" % (__shorten(test.get_expected()))
+	return name
+
 def __create_test(fmt: str, input_value: str, out_value: Optional[str] = None) -> __TestData:
 	value_str = input_value
 	input_value_str = value_str.replace("0o", "0")
@@ -85,7 +115,7 @@ def __generate_bad_tests() -> Iterable[Tuple[str, str, int, __TestData]]:
 
 	for i, t in enumerate(tests):
 		test = __TestData(t[0], t[1])
-		test_data = (f"Bad situation #{i}: \"{'\" \"'.join(test.get_input())}\"", category, 1, test)
+		test_data = (__make_name('Bad situation', i, test), category, 1, test)
 		generated.append(test_data)
 
 	return generated
@@ -101,37 +131,37 @@ def __generate_good_tests() -> Iterable[Tuple[str, str, __TestData]]:
 	category = '16to10'
 	for i, t in enumerate([["%d", f"{hex(i)}"] for i in uint32_t_values]):
 		test =__create_test(t[0], t[1])
-		test_data = (f"{category} #{i}: \"{'\" \"'.join(test.get_input())}\" -> '{test.get_expected()}'", category, test)
+		test_data = (__make_name(category, i, test), category, test)
 		generated.append(test_data)
 
 	category = '8to10'
 	for i, t in enumerate([["%d", f"{oct(i)}"] for i in uint32_t_values]):
 		test =__create_test(t[0], t[1])
-		test_data = (f"{category} #{i}: \"{'\" \"'.join(test.get_input())}\" -> '{test.get_expected()}'", category, test)
+		test_data = (__make_name(category, i, test), category, test)
 		generated.append(test_data)
 
 	category = '2to10'
 	for i, t in enumerate([["%d", f"{bin(i)}"] for i in uint32_t_values]):
 		test =__create_test(t[0], t[1])
-		test_data = (f"{category} #{i}: \"{'\" \"'.join(test.get_input())}\" -> '{test.get_expected()}'", category, test)
+		test_data = (__make_name(category, i, test), category, test)
 		generated.append(test_data)
 
 	category = '10to16'
 	for i, t in enumerate([["%x", f"{int(i)}"] for i in uint32_t_values]):
 		test =__create_test(t[0], t[1])
-		test_data = (f"{category} #{i}: \"{'\" \"'.join(test.get_input())}\" -> '{test.get_expected()}'", category, test)
+		test_data = (__make_name(category, i, test), category, test)
 		generated.append(test_data)
 
 	category = '8to16'
 	for i, t in enumerate([["%x", f"{oct(i)}"] for i in uint32_t_values]):
 		test =__create_test(t[0], t[1])
-		test_data = (f"{category} #{i}: \"{'\" \"'.join(test.get_input())}\" -> '{test.get_expected()}'", category, test)
+		test_data = (__make_name(category, i, test), category, test)
 		generated.append(test_data)
 
 	category = '2to16'
 	for i, t in enumerate([["%x", f"{bin(i)}"] for i in uint32_t_values]):
 		test =__create_test(t[0], t[1])
-		test_data = (f"{category} #{i}: \"{'\" \"'.join(test.get_input())}\" -> '{test.get_expected()}'", category, test)
+		test_data = (__make_name(category, i, test), category, test)
 		generated.append(test_data)
 
 	category = '16to10 extended'
@@ -146,7 +176,7 @@ def __generate_good_tests() -> Iterable[Tuple[str, str, __TestData]]:
 		+ [[f"%{fmt}d", "0x225526"] for fmt in [" 50", "050"]]
 	for i, t in enumerate(tests):
 		test =__create_test(t[0], t[1])
-		test_data = (f"{category} #{i}: \"{'\" \"'.join(test.get_input())}\" -> '{test.get_expected()}'", category, test)
+		test_data = (__make_name(category, i, test), category, test)
 		generated.append(test_data)
 
 	category = 'XtoX'
@@ -158,7 +188,7 @@ def __generate_good_tests() -> Iterable[Tuple[str, str, __TestData]]:
 	]
 	for i, t in enumerate(tests):
 		test =__create_test(t[0], t[1])
-		test_data = (f"{category} #{i}: \"{'\" \"'.join(test.get_input())}\" -> '{test.get_expected()}'", category, test)
+		test_data = (__make_name(category, i, test), category, test)
 		generated.append(test_data)
 
 	category = 'HUGEXto10'
@@ -222,7 +252,7 @@ def __generate_good_tests() -> Iterable[Tuple[str, str, __TestData]]:
 	]
 	for i, t in enumerate(tests):
 		test =__create_test(t[0], t[1], t[2])
-		test_data = (f"{category} #{i}: \"{'\" \"'.join(test.get_input())}\" -> '{test.get_expected()}'", category, test)
+		test_data = (__make_name(category, i, test), category, test)
 		generated.append(test_data)
 		
 	category = 'HUGE10toX'
@@ -240,22 +270,96 @@ def __generate_good_tests() -> Iterable[Tuple[str, str, __TestData]]:
 	]
 	for i, t in enumerate(tests):
 		test =__create_test(t[0], t[1], t[2])
-		test_data = (f"{category} #{i}: \"{'\" \"'.join(test.get_input())}\" -> '{test.get_expected()}'", category, test)
+		test_data = (__make_name(category, i, test), category, test)
 		generated.append(test_data)
 
 	return generated
 
-def get_instance() -> Tuple[base.BaseTester, Optional[Dict[str, float]]]:
+def __wrap128(x: int) -> int:
+	return (x - __INT128_MIN) % 2**128 + __INT128_MIN
+
+def __to_digits(x: int, base: int, digits: str = '0123456789abcdef') -> str:
+	if x == 0:
+		return '0'
+	result = []
+	while x > 0:
+		x, d = divmod(x, base)
+		result.append(digits[d])
+	return ''.join(reversed(result))
+
+# Same as Python's `%` formatting (which is used for references of other tests), but also for `b`.
+def __format(flags: str, width: int, conversion: str, value: int) -> str:
+	base, alternate_prefix, digits = __FUZZ_CONVERSIONS[conversion]
+	body = str(abs(value)) if base == 10 else __to_digits(abs(value), base, digits)
+	sign = '-' if value < 0 else '+' if '+' in flags else ' ' if ' ' in flags else ''
+	prefix = sign + (alternate_prefix if '#' in flags else '')
+
+	padding = max(0, width - len(prefix) - len(body))
+	if '-' in flags:
+		return prefix + body + ' ' * padding
+	if '0' in flags:
+		return prefix + '0' * padding + body
+	return ' ' * padding + prefix + body
+
+def __random_fuzz_test(rng: random.Random) -> List[str]:
+	# Values of all lengths up to 128 bits are equally likely.
+	value = __wrap128(rng.getrandbits(rng.randint(0, 128)) * rng.choice([1, -1]))
+
+	# Negative value is written either with sign, or (not in decimal) as its 128-bit two's complement.
+	base, notation_prefix, max_digits = rng.choice(__FUZZ_NOTATIONS)
+	if value < 0 and base != 10 and rng.random() < 0.5:
+		sign, magnitude = '', value % 2**128
+	else:
+		sign, magnitude = '-' if value < 0 else '', abs(value)
+	digits = __to_digits(magnitude, base)
+	if base == 16:
+		digits = ''.join(rng.choice([d, d.upper()]) for d in digits)
+	# Leading zeros, except for decimal (where they would make it octal).
+	if base != 10:
+		digits = '0' * rng.randint(0, max(0, min(3, max_digits - len(digits)))) + digits
+	input_value = sign + notation_prefix + digits
+
+	# `#` is used only where Python's and C's alternate forms agree.
+	conversion = rng.choice(list(__FUZZ_CONVERSIONS))
+	flags = [flag for flag in '-+ 0#' if rng.random() < 0.3 and (flag != '#' or (conversion in 'xXb' and value != 0))]
+	rng.shuffle(flags)
+	width = rng.randint(1, 48) if rng.random() < 0.5 else 0
+	fmt = "%%%s%s%s" % (''.join(flags), width if width > 0 else '', conversion)
+
+	return [fmt, input_value, __format(''.join(flags), width, conversion, value)]
+
+def __generate_fuzz_tests(count: int, seed: int) -> Iterable[Tuple[str, str, __TestData]]:
+	if count == 0:
+		return []
+
+	# References are computed once for all tests and reused while the generator and its parameters are the same.
+	cache = base.BaseFixtureCache(base.make_suite_dirname(SUITE_NAME), { 'seed': seed, 'fuzz': count }, [__file__])
+	tests = cache.load()
+	if tests is None:
+		rng = random.Random(seed)
+		tests = [__random_fuzz_test(rng) for _ in range(count)]
+		cache.store(tests, [])
+
+	generated: List[Tuple[str, str, __TestData]] = []
+	for i, t in enumerate(tests):
+		test = __TestData(t[0], t[1], t[2])
+		generated.append((__make_name(__FUZZ_CATEGORY, i, test), __FUZZ_CATEGORY, test))
+	return generated
+
+def get_instance(options: Optional[base.BaseSuiteOptions] = None) -> Tuple[base.BaseTester, Optional[Dict[str, float]]]:
 	TIMEOUT = 0.5
 
-	sprintf_tester = base.BaseTester(is_stdin_input = False, is_raw_input = True, is_raw_output = True)
+	sprintf_tester = base.BaseTester(is_stdin_input = False, is_raw_input = True, is_raw_output = True, supports_batch = True)
+
+	if options is None:
+		options = base.BaseSuiteOptions()
 
 	good_tests = __generate_good_tests()
+	good_tests += __generate_fuzz_tests(options.fuzz, options.seed)
 	bad_tests = __generate_bad_tests()
 	coefficients = base.get_coefficients(SUITE_NAME, __ALL_CATEGORIES)
 	good_comparator = __GoodComparator()
 
-
 	for test_data in good_tests:
 		test_name, test_category, test = test_data
 		sprintf_tester.add_success(test_name, test.get_input(), test.get_expected(), timeout = TIMEOUT, categories = [test_category], comparator = good_comparator)
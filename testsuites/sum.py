@@ -39,8 +39,6 @@ def __generate_tests() -> Iterable[Tuple[str, List[str], str, str]]:
 			raw_expected = __file_dir_naming(a, b, 'ref')
 			with open(raw_input, 'w') as stream:
 				stream.write("%d %d\n" % (a, b))
-			if os.path.exists(raw_output):
-				os.remove(raw_output)
 			with open(raw_expected, 'w') as stream:
 				stream.write("%d\n" % (a + b))
 			test_data = (name, [raw_input, raw_output], raw_output, raw_expected)
@@ -48,16 +46,22 @@ def __generate_tests() -> Iterable[Tuple[str, List[str], str, str]]:
 
 	return generated
 
-def get_instance() -> Tuple[base.BaseTester, Optional[Dict[str, float]]]:
+def get_instance(options: Optional[base.BaseSuiteOptions] = None) -> Tuple[base.BaseTester, Optional[Dict[str, float]]]:
 	ALL_COEFFICIENTS = ['a + b']
 
 	hello_tester = base.BaseTester(is_stdin_input = False, is_raw_input = True, is_raw_output = False)
 
-	tests = __generate_tests()
+	cache = base.BaseFixtureCache(SUITE_DIR, {}, [__file__])
+	tests = cache.load()
+	if tests is None:
+		tests = __generate_tests()
+		cache.store(tests, [test_input[0] for _, test_input, _, _ in tests] + [test_expected for _, _, _, test_expected in tests])
 	coefficients = base.get_coefficients(SUITE_NAME, ALL_COEFFICIENTS)
 
 	for test_data in tests:
 		test_name, test_input, test_output_stream, test_expected = test_data
+		if os.path.exists(test_output_stream):
+			os.remove(test_output_stream)
 		hello_tester.add_success(test_name, test_input, test_expected, test_output_stream, categories = ['a + b'])
 
 	return hello_tester, coefficients